@@ -1,15 +1,44 @@
+import asyncio
+import os
+import time
+
+from urllib.parse import urlencode, urlsplit
+
 import aiohttp
 
 from . import exceptions
-from .serialize import Serializer
-from .utils import transform_url_parameters, urljoin
+from .batch import NO_SLOT, ConcurrencyLimiter, run_many
+from .cache import ResponseCache
+from .circuitbreaker import CircuitBreaker
+from .compression import Compression, decompress
+from .download import download_file
+from .hedging import DEFAULT_PERCENTILE as DEFAULT_HEDGE_PERCENTILE, HedgePolicy, hedged
+from .jsonstream import JsonItemsParser
+from .metrics import Metrics
+from .pagination import AutoPagination, Paginator
+from .pool import PoolStats
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .response import DEFAULT_CHUNK_SIZE, LazyResponse, StreamResponse
+from .serialize import Serializer, decode, parse_content_type
+from .template import ResourceTemplate
+from .typed import convert
+from .upload import Multipart, Upload
+from .utils import join_segment, request_key, transform_url_parameters
+
+
+__all__ = ["Resource", "API", "CircuitBreaker", "Compression", "HedgePolicy", "LazyResponse", "Metrics", "Multipart",
+           "RateLimiter", "ResourceTemplate", "ResponseCache", "RetryPolicy", "StreamResponse", "SyncAPI", "Upload"]
 
 
-__all__ = ["Resource", "API"]
+class AttributesMixin:
+    """A Mixin that allows access to an undefined attribute on a class.
 
+    Child resources are created once and cached on their parent, so repeated
+    attribute chains (api.v1.items) are just dictionary lookups.
+    """
 
-class AttributesMixin:
-    """A Mixin that allows access to an undefined attribute on a class."""
+    __slots__ = ()
 
     def __getattr__(self, item):
         # Don't allow access to 'private' by convention attributes.
@@ -18,10 +47,16 @@ class AttributesMixin:
         if item.startswith("_"):
             raise AttributeError(item)
 
-        kwargs = dict(self._store)
-        kwargs.update({"base_url": urljoin(self._store["base_url"], item)})
-
-        return self._get_resource(**kwargs)
+        child = self._children.get(item)
+        if child is None:
+            store = self._store
+            if store["path_template"] is not None:
+                # a child of a template resource isn't described by the template
+                store = dict(store, path_template=None)
+            child = self._children[item] = self._get_resource(store, join_segment(self._base_url, item))
+            # a cached child is shared by all callers, it doesn't keep the last response
+            child._cached = True
+        return child
 
 
 class Resource(AttributesMixin):
@@ -30,50 +65,132 @@ class Resource(AttributesMixin):
     It handles the attribute -> url, kwarg -> query param, and other related behind the scenes
     python to HTTP transformations. It's goal is to represent a single resource
     which may or may not have children.
+
+    All resources of an API share one (read-only) config dictionary, a resource itself
+    only holds its url and its cached children. The resources returned by calls
+    (api.items(42)) keep the last response as _, the cached attribute children
+    (api.items) don't; use as_raw() to get the responses.
     """
 
-    def __init__(self, *args, **kwargs):
+    __slots__ = ("_store", "_base_url", "_url", "_children", "_cached", "_")
+
+    def __init__(self, store, base_url):
         """Init."""
-        self._store = kwargs
+        self._store = store
+        self._base_url = base_url
+        self._children = {}
+        self._cached = False
+
+        if store["append_slash"] and not base_url.endswith("/"):
+            base_url += "/"
+        self._url = base_url
 
-    def __call__(self, id=None, format=None, url_override=None):
+    def __call__(
+        self,
+        id=None,
+        format=None,
+        url_override=None,
+        retry=None,
+        idempotent=None,
+        hedge=None,
+        compress=None,
+        type=None,
+        offload=None,
+    ):
         """Return a new instance of self modified by one or more of the available parameters.
 
         These allows us to do things like override format for a specific request, and enables
         the api.resource(ID).get() syntax to get a specific resource by it's ID.
+
+        retry: RetryPolicy (True: default policy, or maximal number of attempts) for requests of this resource
+               (False disables retries)
+        idempotent: retry requests of this resource even for methods which aren't idempotent (POST, PATCH)
+        hedge: HedgePolicy (True: hedge at the 95th latency percentile, or hedge delay in seconds) for GET
+               requests of this resource (False disables hedging)
+        compress: content coding of request bodies of this resource, e.g. "gzip" (False disables compression)
+        type: decode responses into type (a dataclass, NamedTuple, msgspec Struct, list[Item], ...)
+              instead of dicts and lists, for paginate and aiter_items type is the type of an item;
+              exceptions.ValidationError if a response doesn't match type
+        offload: True: always encode and decode the bodies of this resource in the executor,
+                 False: never (default: bodies of at least offload_threshold bytes)
         """
+        if retry is True:
+            retry = RetryPolicy()
+        elif retry and not isinstance(retry, RetryPolicy):
+            retry = RetryPolicy(max_attempts=retry)
+        if hedge is True:
+            hedge = HedgePolicy(percentile=DEFAULT_HEDGE_PERCENTILE)
+        elif hedge and not isinstance(hedge, HedgePolicy):
+            hedge = HedgePolicy(delay=hedge)
+
+        options = {
+            "format": format,
+            "retry": retry,
+            "idempotent": idempotent,
+            "hedge": hedge,
+            "compress": compress,
+            "type": type,
+            "offload": offload,
+        }
+        options = {k: v for k, v in options.items() if v is not None}
+
         # Short Circuit out if the call is empty
-        if id is None and format is None and url_override is None:
+        if id is None and url_override is None and not options:
             return self
 
-        kwargs = dict(self._store)
+        store = self._store
+        if options or (store["path_template"] is not None and (id is not None or url_override is not None)):
+            # the config is shared with all other resources, never modify it
+            store = dict(store)
+            store.update(options)
+            if id is not None or url_override is not None:
+                store["path_template"] = None
 
-        if id is not None:
-            kwargs["base_url"] = urljoin(self._store["base_url"], id)
+        base_url = self._base_url
 
-        if format is not None:
-            kwargs["format"] = format
+        if id is not None:
+            base_url = join_segment(base_url, id)
 
         if url_override is not None:
             # @@@ This is hacky and we should probably figure out a better way
             #    of handling the case when a POST/PUT doesn't return an object
             #    but a Location to an object that we need to GET.
-            kwargs["base_url"] = url_override
+            base_url = url_override
 
-        kwargs["session"] = self._store["session"]
+        return self._get_resource(store, base_url)
 
-        return self._get_resource(**kwargs)
-
-    async def _request(self, method, data=None, file=None, headers=None, params=None):
+    async def _request(self, method, data=None, file=None, headers=None, params=None, url=None):
         serializer = self._store["serializer"]
-        url = self.url
+        format = self._store["format"]
+        url = url or self.url
+
+        _headers = {"accept": serializer.get_accept(format)}
 
-        _headers = {"accept": serializer.get_content_type()}
+        compression = self._store["compression"]
+        if compression is not None and self._store["accept_encoding"]:
+            _headers["accept-encoding"] = self._store["accept_encoding"]
 
+        serialize_time = None
         if not file:
             if data is not None:
-                _headers["content-type"] = serializer.get_content_type()
-                data = serializer.dumps(data)
+                _headers["content-type"] = serializer.get_content_type(format)
+                start = time.monotonic()
+                # the size of the encoded body isn't known in advance, only offload=True offloads it
+                data = await self._offload(None, serializer.dumps, data, format)
+                serialize_time = time.monotonic() - start
+
+                compress = self._store["compress"]
+                if compress is not False and (compression is not None or compress):
+                    data, encoding = await self._offload(
+                        len(data), (compression or Compression()).compress, data, compress or None
+                    )
+                    if encoding:
+                        _headers["content-encoding"] = encoding
+        elif isinstance(file, (Upload, Multipart)):
+            if isinstance(file, Upload) and data is not None:
+                # form fields and a file
+                file = Multipart(fields=data, files={"file": file})
+            data = file.payload()
         else:
             if data is None:
                 data = {}
@@ -82,10 +199,14 @@ class Resource(AttributesMixin):
         if headers:
             _headers.update(headers)
 
-        resp = await self._store["session"].request(
-            method, url, data=data, params=params, headers=_headers, **self._store["request_kwargs"]
-        )
-        self._ = resp
+        # a file can't be sent twice
+        retry = self._store["retry"] if not file else None
+        resp = await self._send(method, url, data=data, params=params, headers=_headers, retry=retry)
+
+        metrics = self._store["metrics"]
+        if metrics is not None and serialize_time is not None:
+            path = metrics.path(url, self._store["path_template"])
+            metrics.observe("serialize", method, resp.status, path, serialize_time)
 
         if 400 <= resp.status <= 499:
             exception_class = exceptions.HttpNotFoundError if resp.status == 404 else exceptions.HttpClientError
@@ -103,27 +224,101 @@ class Resource(AttributesMixin):
 
         return resp
 
-    async def _try_to_serialize_response(self, resp):
+    async def _send(self, method, url, data=None, params=None, headers=None, retry=None):
+        rate_limiter = self._store["rate_limiter"]
+        circuit_breaker = self._store["circuit_breaker"]
+        path_template = self._store["path_template"]
+        request_kwargs = self._store["request_kwargs"]
+        if self._store["metrics"] is not None:
+            # the path template of the request for the trace hooks of the metrics
+            request_kwargs = dict(request_kwargs, trace_request_ctx=path_template)
+        attempt = 1
+        while True:
+            if circuit_breaker is not None:
+                circuit_breaker.before_call(url, path_template)
+            if rate_limiter is not None:
+                await rate_limiter.wait(url, path_template)
+
+            start = time.monotonic()
+            try:
+                resp = await self._store["session"].request(
+                    method, url, data=data, params=params, headers=headers, **request_kwargs
+                )
+            except Exception as exc:
+                if circuit_breaker is not None:
+                    circuit_breaker.record(url, failed=True, path_template=path_template)
+                if not retry or not retry.is_retryable(
+                    method, attempt, exception=exc, idempotent=self._store["idempotent"]
+                ):
+                    raise
+                await asyncio.sleep(retry.delay(attempt))
+                attempt += 1
+                continue
+
+            if not self._cached:
+                self._ = resp
+            if circuit_breaker is not None:
+                circuit_breaker.record(
+                    url, failed=resp.status >= 500, duration=time.monotonic() - start, path_template=path_template
+                )
+            if rate_limiter is not None:
+                rate_limiter.update(url, resp, path_template)
+
+            if not retry or not retry.is_retryable(
+                method, attempt, status=resp.status, idempotent=self._store["idempotent"]
+            ):
+                return resp
+
+            delay = retry.delay(attempt, response=resp)
+            # give the connection back to the pool before waiting
+            resp.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _try_to_serialize_response(self, resp, type=None):
         s = self._store["serializer"]
         if resp.status in [204, 205]:
             return
 
+        metrics = self._store["metrics"]
+        start = time.monotonic()
         content = await resp.read()
-        if resp.headers.get("Content-Type", None) and content:
-            content_type = resp.headers.get("Content-Type").split(";")[0].strip()
+        if metrics is not None:
+            path = metrics.path(resp.url, self._store["path_template"])
+            metrics.observe("body", resp.method, resp.status, path, time.monotonic() - start)
 
+        content_encoding = resp.headers.get("Content-Encoding", None)
+        if content_encoding and self._store["compression"] is not None and not self._store["session"].auto_decompress:
+            content = await self._offload(len(content), decompress, content, content_encoding)
+
+        content_type = resp.headers.get("Content-Type", None)
+        if content_type and content:
             try:
                 # get serializer
                 stype = s.get_serializer(content_type=content_type)
             except exceptions.SerializerNotAvailable:
                 return content
+
             # serialize content
-            return stype.loads(content)
+            start = time.monotonic()
+            charset = parse_content_type(content_type)[2]
+            decoded = await self._offload(len(content), decode, stype, content, charset, type)
+            if metrics is not None:
+                metrics.observe("deserialize", resp.method, resp.status, path, time.monotonic() - start)
+            return decoded
         return content
 
+    async def _offload(self, size, func, *args):
+        """Return func(*args), called in the executor if the body of size bytes is large enough."""
+        offload = self._store["offload"]
+        threshold = self._store["offload_threshold"]
+        if offload is False or (not offload and (size is None or threshold is None or size < threshold)):
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._store["executor"], func, *args)
+
     async def _process_response(self, resp):
         if 200 <= resp.status <= 299:
-            decoded = await self._try_to_serialize_response(resp)
+            decoded = await self._try_to_serialize_response(resp, type=self._store["type"])
         else:
             # @@@ We should probably do some sort of error here? (Is this even possible?)
             decoded = None
@@ -133,14 +328,108 @@ class Resource(AttributesMixin):
 
         return decoded
 
+    def _slot(self):
+        """Return the async context manager which holds a slot of the concurrency limits."""
+        limiter = self._store["limiter"]
+        if limiter is None:
+            return NO_SLOT
+        return limiter.slot(urlsplit(self.url).netloc)
+
     async def _do_verb_request(self, verb, data=None, file=None, headers=None, params=None):
-        resp = await self._request(verb, data=data, file=file, headers=headers, params=transform_url_parameters(params))
+        async with self._slot():
+            return await self._do_verb_request_unlimited(verb, data=data, file=file, headers=headers, params=params)
+
+    async def _do_verb_request_unlimited(self, verb, data=None, file=None, headers=None, params=None):
+        params = transform_url_parameters(params)
+        if self._store["lazy"]:
+            resp = await self._request(verb, data=data, file=file, headers=headers, params=params)
+            return LazyResponse(resp, lambda resp: self._try_to_serialize_response(resp, type=self._store["type"]))
+
+        if verb == "GET" and not self._store["raw"]:
+            if self._store["coalesce"]:
+                return await self._coalesced_get(headers=headers, params=params)
+            return await self._get(headers=headers, params=params)
+
+        resp = await self._request(verb, data=data, file=file, headers=headers, params=params)
+        return await self._process_response(resp)
+
+    async def _get(self, headers=None, params=None):
+        if self._store["cache"] is not None:
+            return await self._cached_get(headers=headers, params=params)
+
+        if self._store["hedge"]:
+            return await hedged(self._store["hedge"], lambda: self._plain_get(headers=headers, params=params))
+        return await self._plain_get(headers=headers, params=params)
+
+    async def _plain_get(self, headers=None, params=None):
+        resp = await self._request("GET", headers=headers, params=params)
         return await self._process_response(resp)
 
+    async def _coalesced_get(self, headers=None, params=None):
+        # identical concurrent GETs share one in-flight request (single-flight)
+        inflight = self._store["inflight"]
+        key = request_key(self.url, params, headers) + (self._store["format"],)
+        if self._store["type"] is not None:
+            key += (self._store["type"],)
+        future = inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._get(headers=headers, params=params))
+            inflight[key] = future
+
+            def _done(_):
+                if inflight.get(key) is future:
+                    del inflight[key]
+
+            future.add_done_callback(_done)
+
+        # a cancelled caller must not cancel the request for all the others
+        return await asyncio.shield(future)
+
+    async def _cached_get(self, headers=None, params=None):
+        cache = self._store["cache"]
+        key = cache.key(self.url, params, headers) + (self._store["format"],)
+        if self._store["type"] is not None:
+            key += (self._store["type"],)
+        entry = cache.get(key)
+        if entry is not None and entry.is_fresh:
+            return entry.content
+
+        _headers = dict(headers or {})
+        if entry is not None:
+            # stale entry: ask the server if it has changed
+            for name, value in entry.revalidation_headers.items():
+                _headers.setdefault(name, value)
+
+        async def fetch():
+            resp = await self._request("GET", headers=_headers, params=params)
+            if resp.status == 304 and entry is not None:
+                resp.release()
+                return resp, None
+            return resp, await self._process_response(resp)
+
+        if self._store["hedge"]:
+            resp, decoded = await hedged(self._store["hedge"], fetch)
+        else:
+            resp, decoded = await fetch()
+
+        if resp.status == 304 and entry is not None:
+            cache.refresh(key, entry, resp.headers)
+            return entry.content
+        if resp.status == 200:
+            cache.set(key, decoded, resp.headers)
+        return decoded
+
     def as_raw(self):
-        """."""
-        self._store["raw"] = True
-        return self
+        """Return a copy of self which returns (response, decoded content) tuples."""
+        return self._get_resource(dict(self._store, raw=True), self._base_url)
+
+    def as_lazy(self):
+        """Return a copy of self which returns LazyResponse instances.
+
+        The body is read and decoded only when it is accessed, GET requests bypass
+        the cache and coalescing.
+        """
+        return self._get_resource(dict(self._store, lazy=True), self._base_url)
 
     async def get(self, headers=None, **kwargs):
         """GET request."""
@@ -149,7 +438,8 @@ class Resource(AttributesMixin):
     async def post(self, data=None, file=None, headers=None, **kwargs):
         """POST.
 
-        file: file-like object
+        file: file-like object (sent as form field "file" with the data as other form fields),
+              Upload (streamed as request body) or Multipart (several files)
         """
         return await self._do_verb_request("POST", data=data, file=file, headers=headers, params=kwargs)
 
@@ -165,6 +455,108 @@ class Resource(AttributesMixin):
         """DELETE."""
         return await self._do_verb_request("DELETE", headers=headers, params=kwargs)
 
+    async def stream(self, chunk_size=DEFAULT_CHUNK_SIZE, headers=None, **kwargs):
+        """GET request which returns the body as async iterator of byte chunks.
+
+        The body is neither read into memory nor deserialized. The slot of the concurrency
+        limits is held until the body is exhausted or the stream is released.
+        """
+        limiter = self._store["limiter"]
+        if limiter is None:
+            resp = await self._request("GET", headers=headers, params=transform_url_parameters(kwargs))
+            return StreamResponse(resp, chunk_size=chunk_size)
+
+        host = urlsplit(self.url).netloc
+        await limiter.acquire(host)
+        try:
+            resp = await self._request("GET", headers=headers, params=transform_url_parameters(kwargs))
+        except BaseException:
+            limiter.release(host)
+            raise
+        return StreamResponse(resp, chunk_size=chunk_size, on_release=lambda: limiter.release(host))
+
+    async def aiter_items(self, path=None, chunk_size=DEFAULT_CHUNK_SIZE, headers=None, **kwargs):
+        """GET request which yields the items of a JSON array while the body is downloaded.
+
+        path: None for a top-level array, the key (e.g. "hydra:member") or a sequence of keys
+              of the array in the response object
+        """
+        type = self._store["type"]
+        parser = JsonItemsParser(path=path)
+        async with await self.stream(chunk_size=chunk_size, headers=headers, **kwargs) as stream:
+            async for chunk in stream:
+                for item in parser.feed(chunk):
+                    yield item if type is None else convert(item, type)
+        for item in parser.close():
+            yield item if type is None else convert(item, type)
+
+    async def get_many(self, ids, concurrency=None, headers=None, **kwargs):
+        """GET the resource of each id, e.g. api.items.get_many([1, 2, 3], concurrency=50).
+
+        Return the results in the order of ids. A failed request doesn't cancel the
+        others, its exception is returned in place of the result.
+        """
+        ids = list(ids)
+        results = [None] * len(ids)
+        async for index, result in self.iter_many(ids, concurrency=concurrency, headers=headers, **kwargs):
+            results[index] = result
+        return results
+
+    async def iter_many(self, ids, concurrency=None, headers=None, **kwargs):
+        """GET the resource of each id and yield (index, result) as the requests complete.
+
+        A failed request doesn't cancel the others, its exception is yielded as result.
+        """
+
+        async def get(id):
+            return await self(id).get(headers=headers, **kwargs)
+
+        async for index, result in run_many(get, ids, concurrency=concurrency):
+            yield index, result
+
+    async def download(self, path, parts=4, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, headers=None, **kwargs):
+        """Download the resource to the file path and return path.
+
+        The size and Accept-Ranges support are checked with a HEAD request, the body is
+        then fetched in parts concurrent byte range requests, each written straight into
+        the preallocated file. An interrupted download is resumed on the next call.
+        Without HEAD support (e.g. 405) the body is streamed with a single GET request.
+
+        progress: callable(downloaded bytes, total bytes or None)
+        """
+        params = transform_url_parameters(kwargs)
+        url = "%s?%s" % (self.url, urlencode(params)) if params else self.url
+
+        async def fetch(method, download_headers):
+            _headers = dict(headers or {})
+            _headers.update(download_headers)
+            return await self._request(method, headers=_headers, params=params)
+
+        return await download_file(
+            fetch, url, os.fspath(path), parts=parts, chunk_size=chunk_size, progress=progress, slot=self._slot
+        )
+
+    def paginate(self, pagination=None, prefetch=1, headers=None, **kwargs):
+        """Return an async iterator over the items of all pages of a collection.
+
+        pagination: Pagination instance, default: Link header or Hydra pagination (AutoPagination)
+        prefetch: number of pages fetched in the background while a page is consumed (0 disables it)
+        """
+
+        async def fetch(url, params):
+            async with self._slot():
+                resp = await self._request("GET", headers=headers, params=params, url=url)
+                return resp, await self._try_to_serialize_response(resp)
+
+        return Paginator(
+            fetch,
+            pagination or AutoPagination(),
+            self.url,
+            transform_url_parameters(kwargs),
+            prefetch=prefetch,
+            type=self._store["type"],
+        )
+
     # async def options(self, **kwargs):
     #     return await self._do_verb_request("OPTIONS", params=kwargs)
 
@@ -174,15 +566,10 @@ class Resource(AttributesMixin):
     @property
     def url(self):
         """Return url."""
-        url = self._store["base_url"]
-
-        if self._store["append_slash"] and not url.endswith("/"):
-            url += "/"
+        return self._url
 
-        return url
-
-    def _get_resource(self, **kwargs):
-        return self.__class__(**kwargs)
+    def _get_resource(self, store, base_url):
+        return self.__class__(store, base_url)
 
 
 class API(AttributesMixin):
@@ -201,8 +588,47 @@ class API(AttributesMixin):
         raw=False,
         session_kwargs=None,
         request_kwargs=None,
+        cache=None,
+        coalesce=False,
+        max_concurrency=None,
+        max_concurrency_per_host=None,
+        rate_limit=None,
+        retry=None,
+        circuit_breaker=None,
+        hedge=None,
+        compression=None,
+        pool_size=None,
+        pool_size_per_host=None,
+        keepalive_timeout=None,
+        dns_cache_ttl=None,
+        pool_stats=None,
+        metrics=None,
+        offload_threshold=None,
+        executor=None,
     ):
-        """Init."""
+        """Init.
+
+        cache: ResponseCache instance (or True for a default one) to cache GET responses
+        coalesce: identical concurrent GET requests share one in-flight request and its result
+        max_concurrency: maximal number of concurrent requests (streams hold a slot until released)
+        max_concurrency_per_host: maximal number of concurrent requests per host
+        rate_limit: RateLimiter instance or requests per second (per host)
+        retry: RetryPolicy instance, True for a default one or maximal number of attempts
+        circuit_breaker: CircuitBreaker instance (or True for a default one)
+        hedge: HedgePolicy instance, True for one which hedges at the 95th latency percentile or hedge delay
+               in seconds for GET requests
+        compression: Compression instance or content coding (e.g. "gzip") of request bodies
+        pool_size: maximal number of open connections (aiohttp default: 100, 0: unlimited)
+        pool_size_per_host: maximal number of open connections per host (aiohttp default: 0, unlimited)
+        keepalive_timeout: seconds an idle connection is kept open (aiohttp default: 15)
+        dns_cache_ttl: seconds resolved host names are cached (aiohttp default: 10, None: forever)
+        pool_stats: PoolStats instance (or True for a default one) which counts new and reused connections
+                    and the time spent waiting for a connection, see pool_stats()
+        metrics: Metrics instance which records the duration of the phases of all requests
+        offload_threshold: decode (and compress) bodies of at least offload_threshold bytes in the executor
+        executor: concurrent.futures executor for offloaded bodies, default: the loop's default thread pool;
+                  with a ProcessPoolExecutor the serializer and the types have to be picklable
+        """
         if serializer is None:
             serializer = Serializer(default=format)
 
@@ -212,24 +638,101 @@ class API(AttributesMixin):
         if auth is not None:
             session_kwargs["auth"] = aiohttp.BasicAuth(*auth)
 
+        pool_kwargs = {
+            "limit": pool_size,
+            "limit_per_host": pool_size_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": dns_cache_ttl,
+        }
+        pool_kwargs = {k: v for k, v in pool_kwargs.items() if v is not None}
+        if pool_kwargs and (session is not None or "connector" in session_kwargs):
+            raise exceptions.ImproperlyConfigured("pool settings can't be used with an existing session or connector")
+
+        if pool_stats is True:
+            pool_stats = PoolStats()
+        elif pool_stats is False:
+            pool_stats = None
+
         if session is None:
+            if pool_kwargs:
+                session_kwargs["connector"] = aiohttp.TCPConnector(**pool_kwargs)
+            # the trace hooks cost time on every request, only add them if they are used
+            trace_configs = list(session_kwargs.get("trace_configs", []))
+            if pool_stats is not None:
+                trace_configs.append(pool_stats.trace_config())
+            if metrics is not None:
+                trace_configs.append(metrics.trace_config())
+            if trace_configs:
+                session_kwargs["trace_configs"] = trace_configs
             session = aiohttp.ClientSession(**session_kwargs)
+        elif pool_stats is not None or metrics is not None:
+            raise exceptions.ImproperlyConfigured("pool_stats and metrics can't be used with an existing session")
+
+        if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+
+        if retry is True:
+            retry = RetryPolicy()
+        elif retry and not isinstance(retry, RetryPolicy):
+            retry = RetryPolicy(max_attempts=retry)
+
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker()
+
+        if hedge is True:
+            hedge = HedgePolicy(percentile=DEFAULT_HEDGE_PERCENTILE)
+        elif hedge and not isinstance(hedge, HedgePolicy):
+            hedge = HedgePolicy(delay=hedge)
+
+        if isinstance(compression, str):
+            compression = Compression(encoding=compression)
+
+        if cache is True:
+            cache = ResponseCache()
+        elif cache is False:
+            cache = None
 
         # internal config
         self._store = {
             "base_url": base_url,
-            "format": format if format is not None else "json",
+            "format": format if format is not None else serializer.default,
             "append_slash": append_slash,
             "session": session,
             "serializer": serializer,
             "raw": raw,
+            "lazy": False,
             "request_kwargs": request_kwargs or {},
+            "cache": cache,
+            "coalesce": coalesce,
+            "inflight": {},
+            "pool_stats": pool_stats,
+            "metrics": metrics,
+            "path_template": None,
+            "offload": None,
+            "offload_threshold": offload_threshold,
+            "executor": executor,
+            "limiter": None,
+            "rate_limiter": rate_limit,
+            "retry": retry,
+            "idempotent": False,
+            "circuit_breaker": circuit_breaker or None,
+            "hedge": hedge,
+            "compression": compression,
+            "compress": None,
+            "type": None,
+            "accept_encoding": compression.get_accept_encoding(session.auto_decompress) if compression else None,
         }
 
+        if max_concurrency or max_concurrency_per_host:
+            self._store["limiter"] = ConcurrencyLimiter(max_concurrency, max_concurrency_per_host)
+
         # Do some Checks for Required Values
         if self._store.get("base_url") is None:
             raise exceptions.ImproperlyConfigured("base_url is required")
 
+        self._base_url = base_url
+        self._children = {}
+
     async def __aenter__(self):
         """Asyncio with enter."""
         return self
@@ -242,5 +745,36 @@ class API(AttributesMixin):
         """Close underlying session."""
         await self._store["session"].close()
 
-    def _get_resource(self, **kwargs):
-        return self.resource_class(**kwargs)
+    def pool_stats(self):
+        """Return the state of the connection pool, in total and per host ("host:port").
+
+        open, idle and acquired connections, new (created) and reused connections, the
+        reuse ratio and the number of and the time spent waiting for a free connection.
+
+        The connection counters (created, reused, queued and wait time) are only collected
+        with API(pool_stats=True), otherwise they are 0.
+        """
+        pool_stats = self._store["pool_stats"] or PoolStats()
+        return pool_stats.snapshot(self._store["session"].connector)
+
+    def template(self, template):
+        """Return a precompiled ResourceTemplate for a path relative to base_url.
+
+        items = api.template("/tenants/{tenant}/items/{id}")
+        await items(tenant="acme", id=42).get()
+        """
+        # the resources of a template share one config with the path template for the metrics
+        store = dict(self._store, path_template=urlsplit(join_segment(self._base_url, template.lstrip("/"))).path)
+        return ResourceTemplate(
+            template,
+            self._base_url,
+            lambda url: self._get_resource(store, url),
+            append_slash=self._store["append_slash"],
+        )
+
+    def _get_resource(self, store, base_url):
+        return self.resource_class(store, base_url)
+
+
+# the synchronous facade wraps API
+from .sync import SyncAPI  # noqa: E402
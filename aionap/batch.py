@@ -0,0 +1,108 @@
+import asyncio
+import collections
+
+
+__all__ = ["ConcurrencyLimiter", "run_many"]
+
+
+class ConcurrencyLimiter:
+    """Limit the number of concurrent requests, in total and per host."""
+
+    def __init__(self, limit=None, limit_per_host=None):
+        """Init.
+
+        limit: maximal number of concurrent requests (None: unlimited)
+        limit_per_host: maximal number of concurrent requests per host (None: unlimited)
+        """
+        for value in (limit, limit_per_host):
+            if value is not None and value <= 0:
+                raise ValueError("limits must be positive integers")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._semaphore = asyncio.Semaphore(limit) if limit else None
+        self._host_semaphores = collections.defaultdict(lambda: asyncio.Semaphore(limit_per_host))
+
+    def _semaphores(self, host):
+        semaphores = []
+        if self.limit_per_host and host is not None:
+            semaphores.append(self._host_semaphores[host])
+        if self._semaphore is not None:
+            semaphores.append(self._semaphore)
+        return semaphores
+
+    async def acquire(self, host=None):
+        """Wait for a free slot (for host)."""
+        acquired = []
+        try:
+            for semaphore in self._semaphores(host):
+                await semaphore.acquire()
+                acquired.append(semaphore)
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+
+    def release(self, host=None):
+        """Release a slot (for host)."""
+        for semaphore in self._semaphores(host):
+            semaphore.release()
+
+    def slot(self, host=None):
+        """Async context manager which holds a slot (for host)."""
+        return _Slot(self, host)
+
+
+class _Slot:
+    def __init__(self, limiter, host):
+        self.limiter = limiter
+        self.host = host
+
+    async def __aenter__(self):
+        await self.limiter.acquire(self.host)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.limiter.release(self.host)
+
+
+class _NoSlot:
+    async def __aenter__(self):
+        pass
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+# slot of requests without concurrency limits
+NO_SLOT = _NoSlot()
+
+
+async def run_many(func, args, concurrency=None):
+    """Call the coroutine function func for each argument with at most concurrency calls at once.
+
+    Yield (index, result) in the order of completion. An exception of one call
+    is yielded as its result and doesn't cancel the other calls.
+    """
+    args = list(args)
+    if concurrency is not None and concurrency <= 0:
+        raise ValueError("concurrency must be a positive integer")
+    if not args:
+        return
+
+    pending = iter(enumerate(args))
+    results = asyncio.Queue()
+
+    async def worker():
+        for index, arg in pending:
+            try:
+                result = await func(arg)
+            except Exception as exc:
+                result = exc
+            await results.put((index, result))
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(min(concurrency or len(args), len(args)))]
+    try:
+        for _ in range(len(args)):
+            yield await results.get()
+    finally:
+        for w in workers:
+            w.cancel()
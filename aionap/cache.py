@@ -0,0 +1,168 @@
+import time
+
+from collections import OrderedDict
+
+from .utils import parse_http_date, request_key
+
+
+__all__ = ["ResponseCache"]
+
+
+def parse_cache_control(value):
+    """Parse a Cache-Control header value into a dictionary.
+
+    "no-cache, max-age=60" -> {"no-cache": None, "max-age": "60"}
+    """
+    directives = {}
+    if not value:
+        return directives
+
+    for directive in value.split(","):
+        name, _, arg = directive.strip().partition("=")
+        if not name:
+            continue
+        directives[name.strip().lower()] = arg.strip().strip('"') if arg else None
+    return directives
+
+
+CACHE_HEADERS = ("Cache-Control", "Expires", "ETag", "Last-Modified")
+
+
+class CacheEntry:
+    """A cached (already decoded) response body plus its caching headers."""
+
+    __slots__ = ("content", "headers", "expires", "stored")
+
+    def __init__(self, content, headers=None, expires=None, stored=None):
+        """Init."""
+        self.content = content
+        self.headers = headers or {}
+        self.expires = expires
+        self.stored = stored if stored is not None else time.monotonic()
+
+    @property
+    def etag(self):
+        """ETag validator."""
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self):
+        """Last-Modified validator."""
+        return self.headers.get("Last-Modified")
+
+    @property
+    def is_fresh(self):
+        """Return True if the entry can be used without asking the server."""
+        return self.expires is not None and time.monotonic() < self.expires
+
+    @property
+    def revalidation_headers(self):
+        """Conditional request headers for this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """In-memory LRU cache for decoded GET responses.
+
+    Entries are keyed by url, query parameters and request headers. Freshness is
+    taken from the Cache-Control (max-age, no-cache, no-store) and Expires response
+    headers; stale entries are revalidated with If-None-Match/If-Modified-Since and
+    a 304 response returns the cached object.
+
+    max_size: maximal number of entries, the least recently used entry is evicted first
+    ttl: maximal lifetime of an entry in seconds since it was stored or revalidated
+
+    Cached objects are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        """Init."""
+        if max_size is not None and max_size <= 0:
+            raise ValueError("max_size must be a positive integer")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """Number of cached entries."""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Return True if key is cached."""
+        return self.get(key) is not None
+
+    key = staticmethod(request_key)
+
+    def get(self, key):
+        """Return the entry for key or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if self.ttl is not None and time.monotonic() - entry.stored > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key, content, headers):
+        """Store content with the caching information of the response headers.
+
+        Returns the new entry or None if the response must not be cached.
+        """
+        headers = {name: headers.get(name) for name in CACHE_HEADERS if headers.get(name)}
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in directives:
+            self.delete(key)
+            return None
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        now = time.monotonic()
+        expires = None
+
+        if "no-cache" not in directives:
+            if directives.get("max-age") is not None:
+                try:
+                    expires = now + max(0, int(directives["max-age"]))
+                except ValueError:
+                    expires = None
+            elif headers.get("Expires"):
+                expires_at = parse_http_date(headers.get("Expires"))
+                # an invalid Expires value means "already expired"
+                expires = now + (expires_at - time.time() if expires_at is not None else 0)
+
+        if expires is None and not etag and not last_modified:
+            # nothing to reuse or to revalidate with
+            self.delete(key)
+            return None
+
+        entry = CacheEntry(content, headers=headers, expires=expires, stored=now)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while self.max_size is not None and len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+        return entry
+
+    def refresh(self, key, entry, headers):
+        """Update an entry after a 304 Not Modified response."""
+        # the 304 response may carry new validators or freshness information
+        merged = dict(entry.headers)
+        merged.update({name: headers.get(name) for name in CACHE_HEADERS if headers.get(name)})
+        return self.set(key, entry.content, merged)
+
+    def delete(self, key):
+        """Remove key from the cache."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
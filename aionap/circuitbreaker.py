@@ -0,0 +1,172 @@
+import collections
+import time
+
+from urllib.parse import urlsplit
+
+from . import exceptions
+from .utils import path_template as normalize_path
+
+
+__all__ = ["CircuitBreaker"]
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class Circuit:
+    """State of one circuit."""
+
+    def __init__(self, clock):
+        """Init."""
+        self.clock = clock
+        self.state = CLOSED
+        self.calls = collections.deque()
+        self.opened_at = None
+        self.trial_started_at = None
+        self.trials = 0
+
+    def failures(self):
+        """Number of failed calls in the window."""
+        return sum(1 for _, failed in self.calls if failed)
+
+    def reset(self, state):
+        """Switch to state and forget all calls."""
+        self.state = state
+        self.calls.clear()
+        self.trials = 0
+        self.opened_at = self.clock() if state == OPEN else None
+
+
+class CircuitBreaker:
+    """Fail fast while an upstream is unhealthy.
+
+    A circuit (per host or per path template) opens as soon as at least failure_rate of
+    the calls in the last window seconds failed (given at least min_calls calls).
+    A call fails on a connection error or timeout, a 5xx response or, if
+    slow_call_duration is set, if it takes longer than slow_call_duration seconds.
+
+    While a circuit is open all requests fail immediately with CircuitOpenError.
+    After recovery_timeout seconds the circuit is half-open and lets half_open_calls
+    trial requests pass: it closes again if they succeed and reopens otherwise.
+
+    scope: "host" or "path" (one circuit per path template, the template of
+           api.template() or the url path with the ids replaced by {id})
+    """
+
+    scopes = ("host", "path")
+
+    def __init__(
+        self,
+        failure_rate=0.5,
+        min_calls=10,
+        window=60.0,
+        slow_call_duration=None,
+        recovery_timeout=30.0,
+        half_open_calls=1,
+        scope="host",
+        clock=time.monotonic,
+    ):
+        """Init."""
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be in (0, 1]")
+        if scope not in self.scopes:
+            raise ValueError("scope must be one of %s" % ", ".join(self.scopes))
+        self.failure_rate = failure_rate
+        self.min_calls = max(1, min_calls)
+        self.window = window
+        self.slow_call_duration = slow_call_duration
+        self.recovery_timeout = recovery_timeout
+        self.half_open_calls = max(1, half_open_calls)
+        self.scope = scope
+        self.clock = clock
+        self._circuits = {}
+
+    def key(self, url, path_template=None):
+        """Circuit key of url."""
+        parts = urlsplit(url)
+        if self.scope == "host":
+            return parts.netloc
+        return parts.netloc + (path_template if path_template is not None else normalize_path(parts.path))
+
+    def _circuit(self, url, path_template=None):
+        key = self.key(url, path_template)
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = Circuit(self.clock)
+        return key, circuit
+
+    def state(self, url, path_template=None):
+        """Return the state ("closed", "open" or "half-open") of the circuit of url."""
+        key, circuit = self._circuit(url, path_template)
+        self._update_state(circuit)
+        return circuit.state
+
+    def stats(self):
+        """Return state, number of calls and failures in the window of every circuit."""
+        stats = {}
+        for key, circuit in self._circuits.items():
+            self._update_state(circuit)
+            calls = len(circuit.calls)
+            failures = circuit.failures()
+            stats[key] = {
+                "state": circuit.state,
+                "calls": calls,
+                "failures": failures,
+                "failure_rate": failures / calls if calls else 0.0,
+            }
+        return stats
+
+    def _update_state(self, circuit):
+        now = self.clock()
+        if circuit.state == OPEN and now - circuit.opened_at >= self.recovery_timeout:
+            circuit.reset(HALF_OPEN)
+        while circuit.calls and now - circuit.calls[0][0] > self.window:
+            circuit.calls.popleft()
+
+    def before_call(self, url, path_template=None):
+        """Raise CircuitOpenError if a request to url must not be sent."""
+        key, circuit = self._circuit(url, path_template)
+        self._update_state(circuit)
+        now = self.clock()
+
+        if circuit.state == OPEN:
+            raise exceptions.CircuitOpenError(
+                "Circuit open: %s" % key,
+                key=key,
+                retry_after=self.recovery_timeout - (now - circuit.opened_at),
+            )
+
+        if circuit.state == HALF_OPEN:
+            # a trial call which never reported back doesn't block forever
+            if circuit.trials >= self.half_open_calls and now - circuit.trial_started_at < self.recovery_timeout:
+                raise exceptions.CircuitOpenError("Circuit half-open: %s" % key, key=key, retry_after=0.0)
+            circuit.trials += 1
+            circuit.trial_started_at = now
+
+    def record(self, url, failed=False, duration=None, path_template=None):
+        """Record the outcome of a request to url."""
+        key, circuit = self._circuit(url, path_template)
+        if duration is not None and self.slow_call_duration is not None and duration > self.slow_call_duration:
+            failed = True
+
+        if circuit.state == HALF_OPEN:
+            if failed:
+                circuit.reset(OPEN)
+            else:
+                circuit.trials -= 1
+                circuit.calls.append((self.clock(), False))
+                if len(circuit.calls) >= self.half_open_calls:
+                    circuit.reset(CLOSED)
+            return
+
+        if circuit.state == OPEN:
+            # a call which started before the circuit opened
+            return
+
+        circuit.calls.append((self.clock(), failed))
+        self._update_state(circuit)
+        calls = len(circuit.calls)
+        if calls >= self.min_calls and circuit.failures() / calls >= self.failure_rate:
+            circuit.reset(OPEN)
@@ -0,0 +1,114 @@
+import gzip
+import zlib
+
+import aiohttp
+
+from . import exceptions
+
+
+__all__ = ["Compression", "CODECS"]
+
+
+# content coding -> (compress, decompress)
+CODECS = {
+    "gzip": (gzip.compress, gzip.decompress),
+    "deflate": (zlib.compress, zlib.decompress),
+}
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+if brotli is not None:
+    CODECS["br"] = (brotli.compress, brotli.decompress)
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        from backports import zstd
+    except ImportError:
+        zstd = None
+
+if zstd is not None:
+    CODECS["zstd"] = (zstd.compress, zstd.decompress)
+else:
+    try:
+        import zstandard
+    except ImportError:
+        pass
+    else:
+        CODECS["zstd"] = (
+            lambda data: zstandard.ZstdCompressor().compress(data),
+            lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+        )
+
+
+def aiohttp_encodings():
+    """Content codings aiohttp decodes itself (ClientSession(auto_decompress=True))."""
+    encodings = ["gzip", "deflate"]
+    compression_utils = getattr(aiohttp, "compression_utils", None)
+    if getattr(compression_utils, "HAS_BROTLI", False):
+        encodings.append("br")
+    if getattr(compression_utils, "HAS_ZSTD", False):
+        encodings.append("zstd")
+    return encodings
+
+
+def compress(data, encoding):
+    """Compress data (bytes or str) with the content coding encoding."""
+    if encoding not in CODECS:
+        raise exceptions.ImproperlyConfigured("%s compression is not available" % encoding)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return CODECS[encoding][0](data)
+
+
+def decompress(data, encodings):
+    """Decode data encoded with the Content-Encoding header value encodings."""
+    # codings are listed in the order they were applied
+    for encoding in reversed([e.strip().lower() for e in encodings.split(",") if e.strip()]):
+        if encoding == "identity":
+            continue
+        if encoding not in CODECS:
+            raise exceptions.ImproperlyConfigured("%s decompression is not available" % encoding)
+        data = CODECS[encoding][1](data)
+    return data
+
+
+class Compression:
+    """Compression of request bodies and negotiation of compressed responses.
+
+    encoding: content coding of request bodies ("gzip", "deflate", "br" or "zstd"), None: don't compress
+    threshold: only compress request bodies of at least threshold bytes
+    accept_encodings: content codings accepted for responses, default: all which can be decoded
+    """
+
+    def __init__(self, encoding=None, threshold=1024, accept_encodings=None):
+        """Init."""
+        if encoding is not None and encoding not in CODECS:
+            raise exceptions.ImproperlyConfigured("%s compression is not available" % encoding)
+        if accept_encodings is not None:
+            for accept_encoding in accept_encodings:
+                if accept_encoding not in CODECS:
+                    raise exceptions.ImproperlyConfigured("%s decompression is not available" % accept_encoding)
+        self.encoding = encoding
+        self.threshold = threshold
+        self.accept_encodings = accept_encodings
+
+    def get_accept_encoding(self, auto_decompress=True):
+        """Accept-Encoding header value."""
+        available = aiohttp_encodings() if auto_decompress else list(CODECS)
+        encodings = self.accept_encodings if self.accept_encodings is not None else available
+        return ", ".join(e for e in encodings if e in available)
+
+    def compress(self, data, encoding=None):
+        """Return (data, content coding) with data compressed if it is large enough."""
+        encoding = encoding if encoding is not None else self.encoding
+        if not encoding or data is None or len(data) < self.threshold:
+            return data, None
+        return compress(data, encoding), encoding
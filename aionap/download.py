@@ -0,0 +1,210 @@
+import asyncio
+import json
+import os
+import re
+import time
+
+from . import exceptions
+from .batch import NO_SLOT
+from .response import DEFAULT_CHUNK_SIZE
+
+
+__all__ = ["Manifest", "download_file"]
+
+
+PART_SUFFIX = ".part"
+MANIFEST_SUFFIX = ".part.json"
+
+CONTENT_RANGE = re.compile(r"^\s*bytes\s+(\d+)-(\d+)/(\d+|\*)\s*$", re.IGNORECASE)
+
+
+class Manifest:
+    """State of a partial download, stored next to the file as <path>.part.json.
+
+    ranges: list of [start, end (exclusive), position (first byte not yet written)]
+    """
+
+    def __init__(self, path, url, size, validator, ranges):
+        """Init."""
+        self.path = path
+        self.url = url
+        self.size = size
+        self.validator = validator
+        self.ranges = ranges
+
+    @classmethod
+    def create(cls, path, url, size, validator, parts):
+        """Split size bytes into parts ranges."""
+        part_size = -(-size // parts)
+        ranges = [[start, min(start + part_size, size), start] for start in range(0, size, part_size)]
+        return cls(path, url, size, validator, ranges)
+
+    @classmethod
+    def load(cls, path):
+        """Return the manifest of the download to path or None."""
+        try:
+            with open(path + MANIFEST_SUFFIX) as f:
+                state = json.load(f)
+            return cls(path, state["url"], state["size"], state["validator"], state["ranges"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def matches(self, url, size, validator):
+        """Return True if the partial download belongs to the same version of the resource."""
+        return (self.url, self.size, self.validator) == (url, size, validator) and validator is not None
+
+    @property
+    def downloaded(self):
+        """Number of bytes already written."""
+        return sum(position - start for start, _, position in self.ranges)
+
+    def save(self):
+        """Write the manifest atomically."""
+        state = {"url": self.url, "size": self.size, "validator": self.validator, "ranges": self.ranges}
+        with open(self.path + MANIFEST_SUFFIX + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(self.path + MANIFEST_SUFFIX + ".tmp", self.path + MANIFEST_SUFFIX)
+
+    def remove(self):
+        """Remove the manifest."""
+        try:
+            os.remove(self.path + MANIFEST_SUFFIX)
+        except FileNotFoundError:
+            pass
+
+
+def parse_content_range(value):
+    """Return (start, end (inclusive), size or None) of a Content-Range header or None."""
+    match = CONTENT_RANGE.match(value or "")
+    if match is None:
+        return None
+    start, end, size = match.groups()
+    return int(start), int(end), int(size) if size != "*" else None
+
+
+def pwrite(fd, data, offset):
+    """Write data at offset without moving a shared file position."""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+async def download_file(
+    fetch, url, path, parts=4, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, save_interval=1.0, slot=lambda: NO_SLOT
+):
+    """Download url to path, in parts concurrent byte range requests if the server supports them.
+
+    fetch: coroutine function (method, headers) -> response
+    slot: callable() -> async context manager held during each request (e.g. of a ConcurrencyLimiter)
+    progress: callable(downloaded bytes, total bytes or None)
+    save_interval: seconds between saves of the manifest of an unfinished download
+
+    The data is written into a preallocated <path>.part file, which is renamed to
+    path when the download is complete. An interrupted download is resumed from the
+    manifest if the resource still has the same ETag (or Last-Modified) and size.
+    If the HEAD request fails (e.g. 405 Method Not Allowed) the resource is downloaded
+    with a single GET request.
+    """
+    if parts < 1:
+        raise ValueError("parts must be a positive integer")
+
+    try:
+        async with slot():
+            head = await fetch("HEAD", {"Accept-Encoding": "identity"})
+            head.release()
+    except exceptions.AioNapHttpBaseException:
+        await _download_single(fetch, path, None, chunk_size, progress, slot)
+        return path
+    size = head.headers.get("Content-Length")
+    size = int(size) if size is not None else None
+    validator = head.headers.get("ETag") or head.headers.get("Last-Modified")
+
+    if not size or head.headers.get("Accept-Ranges", "").lower() != "bytes" or not hasattr(os, "pwrite"):
+        await _download_single(fetch, path, size, chunk_size, progress, slot)
+        return path
+
+    manifest = Manifest.load(path)
+    resume = manifest is not None and manifest.matches(url, size, validator) and os.path.exists(path + PART_SUFFIX)
+    if not resume:
+        manifest = Manifest.create(path, url, size, validator, parts)
+
+    fd = os.open(path + PART_SUFFIX, os.O_RDWR | os.O_CREAT)
+    try:
+        if not resume:
+            os.ftruncate(fd, size)
+            manifest.save()
+
+        state = {"downloaded": manifest.downloaded, "saved": time.monotonic()}
+
+        async def fetch_range(byte_range):
+            async with slot():
+                await _fetch_range(byte_range)
+
+        async def _fetch_range(byte_range):
+            start, end, position = byte_range
+            headers = {"Range": "bytes=%s-%s" % (position, end - 1), "Accept-Encoding": "identity"}
+            if validator is not None:
+                # the server sends the whole (new) resource if it has changed
+                headers["If-Range"] = validator
+            resp = await fetch("GET", headers)
+            try:
+                if resp.status != 206:
+                    raise exceptions.DownloadError("Range request of %s returned %s" % (url, resp.status))
+                content_range = parse_content_range(resp.headers.get("Content-Range"))
+                if content_range is None or content_range[0] != position:
+                    raise exceptions.DownloadError("Range request of %s for bytes %s-%s returned Content-Range %r" % (
+                        url, position, end - 1, resp.headers.get("Content-Range"),
+                    ))
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    chunk = chunk[:end - position]
+                    pwrite(fd, chunk, position)
+                    position += len(chunk)
+                    byte_range[2] = position
+                    state["downloaded"] += len(chunk)
+                    if progress is not None:
+                        progress(state["downloaded"], size)
+                    if time.monotonic() - state["saved"] >= save_interval:
+                        manifest.save()
+                        state["saved"] = time.monotonic()
+                if position < end:
+                    raise exceptions.DownloadError("Range %s-%s of %s is incomplete" % (start, end - 1, url))
+            finally:
+                resp.release()
+
+        tasks = [asyncio.ensure_future(fetch_range(r)) for r in manifest.ranges if r[2] < r[1]]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            manifest.save()
+    finally:
+        os.close(fd)
+
+    os.replace(path + PART_SUFFIX, path)
+    manifest.remove()
+    return path
+
+
+async def _download_single(fetch, path, size, chunk_size, progress, slot):
+    async with slot():
+        await _write_single(fetch, path, size, chunk_size, progress)
+    os.replace(path + PART_SUFFIX, path)
+
+
+async def _write_single(fetch, path, size, chunk_size, progress):
+    resp = await fetch("GET", {})
+    try:
+        if size is None and resp.headers.get("Content-Length") is not None:
+            size = int(resp.headers["Content-Length"])
+        downloaded = 0
+        with open(path + PART_SUFFIX, "wb") as f:
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                f.write(chunk)
+                downloaded += len(chunk)
+                if progress is not None:
+                    progress(downloaded, size)
+    finally:
+        resp.release()
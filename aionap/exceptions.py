@@ -35,3 +35,21 @@ class SerializerNotAvailable(AioNapBaseException):
 
 class ImproperlyConfigured(AioNapBaseException):
     """AioNap is somehow improperly configured."""
+
+
+class CircuitOpenError(AioNapBaseException):
+    """The circuit breaker doesn't let requests pass, the upstream is unhealthy."""
+
+    def __init__(self, *args, key=None, retry_after=None):
+        """Init."""
+        self.key = key
+        self.retry_after = retry_after
+        super().__init__(*args)
+
+
+class DownloadError(AioNapBaseException):
+    """A (ranged) download failed, e.g. because the resource changed while it was downloaded."""
+
+
+class ValidationError(AioNapBaseException, ValueError):
+    """Decoded data doesn't match the requested type (the same with and without msgspec)."""
@@ -0,0 +1,88 @@
+import asyncio
+import collections
+import time
+
+
+__all__ = ["HedgePolicy", "hedged"]
+
+
+# percentile of the hedge delay of hedge=True
+DEFAULT_PERCENTILE = 95
+
+
+class HedgePolicy:
+    """Send a second identical GET request if the first one is slow.
+
+    delay: seconds to wait for the first attempt before the hedge is sent
+    percentile: use this percentile (e.g. 95) of the observed latencies as delay as soon
+                as min_samples latencies have been observed (delay is used until then)
+    max_ratio: maximal ratio of hedged requests (0.1: at most 10% extra requests)
+    """
+
+    def __init__(self, delay=None, percentile=None, max_ratio=0.1, min_samples=20, window=1000, max_burst=10):
+        """Init."""
+        if delay is None and percentile is None:
+            raise ValueError("delay or percentile is required")
+        if percentile is not None and not 0 < percentile < 100:
+            raise ValueError("percentile must be in (0, 100)")
+        if not 0 < max_ratio <= 1:
+            raise ValueError("max_ratio must be in (0, 1]")
+        self.delay = delay
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.max_burst = max_burst
+        self.latencies = collections.deque(maxlen=window)
+        self._credits = 0.0
+
+    def hedge_delay(self):
+        """Return the delay of the hedge of a new request (None: don't hedge)."""
+        # every request earns max_ratio hedges
+        self._credits = min(self.max_burst, self._credits + self.max_ratio)
+
+        if self.percentile is not None and len(self.latencies) >= self.min_samples:
+            latencies = sorted(self.latencies)
+            index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+            return latencies[index]
+        return self.delay
+
+    def acquire(self):
+        """Return True if a hedge may be sent."""
+        if self._credits < 1:
+            return False
+        self._credits -= 1
+        return True
+
+    def observe(self, latency):
+        """Record the latency of a request."""
+        self.latencies.append(latency)
+
+
+async def hedged(policy, func):
+    """Await func(); call it a second time if it takes longer than the hedge delay.
+
+    Return the result of the first successful call and cancel the other one.
+    """
+    start = time.monotonic()
+    delay = policy.hedge_delay()
+    tasks = [asyncio.ensure_future(func())]
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and policy.acquire():
+                tasks.append(asyncio.ensure_future(func()))
+
+        error = None
+        pending = tasks
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    policy.observe(time.monotonic() - start)
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,224 @@
+import codecs
+import json
+import re
+
+
+__all__ = ["JsonItemsParser"]
+
+
+WHITESPACE = " \t\n\r"
+# the end of a number, true, false or null
+SCALAR_END = re.compile(r"[\s,:\]}]")
+# the next character which changes the nesting level or starts a string
+STRUCTURAL = re.compile(r'[\[\]{}"]')
+BRACKETS = {"[": "]", "{": "}"}
+# the next character which ends a string or escapes the next one
+STRING_SPECIAL = re.compile(r'["\\]')
+
+# marker for a parser step which didn't produce an item
+_NOTHING = object()
+
+
+class _Incomplete(Exception):
+    """More data is needed to continue parsing."""
+
+
+class JsonItemsParser:
+    """Incremental parser which yields the items of a JSON array.
+
+    Feed it the body of a response chunk by chunk and it returns every array item
+    as soon as it is complete:
+
+        parser = JsonItemsParser(path="hydra:member")
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+        parser.close()
+
+    path: None for a top-level array, the key of the array in the top-level object
+          (e.g. "hydra:member") or a sequence of keys for nested objects
+          (e.g. ("data", "items"))
+
+    Only the array items are kept in memory (one at a time); everything outside
+    of the array is skipped.
+    """
+
+    def __init__(self, path=None):
+        """Init."""
+        if path is None:
+            path = ()
+        elif isinstance(path, str):
+            path = (path,)
+        self.path = tuple(path)
+
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        # (start, position, open brackets, in string) of the value which is scanned
+        self._scan = None
+        self._level = 0
+        self._key = None
+        self._state = "array_start" if not self.path else "object_start"
+
+    @property
+    def done(self):
+        """True as soon as the end of the array has been reached."""
+        return self._state == "done"
+
+    def feed(self, data):
+        """Feed the next chunk of data (bytes or str) and return the completed items."""
+        if isinstance(data, bytes):
+            data = self._text_decoder.decode(data)
+        return self._parse(data, final=False)
+
+    def close(self):
+        """Signal the end of the document and return the remaining items."""
+        items = self._parse(self._text_decoder.decode(b"", final=True), final=True)
+        if not self.done:
+            raise ValueError("Incomplete JSON document or array not found: %s" % (self.path,))
+        return items
+
+    def _parse(self, data, final):
+        items = []
+        if self.done:
+            return items
+
+        self._buf = self._buf[self._pos:] + data
+        if self._scan is not None:
+            start, pos, brackets, in_string = self._scan
+            self._scan = (start - self._pos, pos - self._pos, brackets, in_string)
+        self._pos = 0
+        try:
+            while not self.done:
+                step = getattr(self, "_step_%s" % self._state)
+                item = step(final)
+                if item is not _NOTHING:
+                    items.append(item)
+        except _Incomplete:
+            pass
+        return items
+
+    # helpers
+    def _skip_whitespace(self, pos):
+        buf = self._buf
+        while pos < len(buf) and buf[pos] in WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            raise _Incomplete()
+        return pos
+
+    def _expect(self, pos, char):
+        pos = self._skip_whitespace(pos)
+        if self._buf[pos] != char:
+            raise ValueError("Expecting %r at position %d, got %r" % (char, pos, self._buf[pos]))
+        return pos + 1
+
+    def _value_end(self, start, final):
+        """Return the end of the value at start, scan every character only once."""
+        buf = self._buf
+        if buf[start] not in '[{"':
+            match = SCALAR_END.search(buf, start)
+            if match is not None:
+                return match.start()
+            if not final:
+                # e.g. "12" or "tr" may continue in the next chunk
+                raise _Incomplete()
+            return len(buf)
+
+        if self._scan is not None and self._scan[0] == start:
+            _, pos, brackets, in_string = self._scan
+        else:
+            pos, brackets, in_string = start, "", False
+        while True:
+            match = (STRING_SPECIAL if in_string else STRUCTURAL).search(buf, pos)
+            if match is None or (in_string and match.group() == "\\" and match.end() == len(buf)):
+                # resume at the unfinished escape sequence or the end of the buffer
+                self._scan = (start, match.start() if match is not None else len(buf), brackets, in_string)
+                raise _Incomplete()
+            char = match.group()
+            pos = match.end()
+            if in_string:
+                if char == "\\":
+                    pos += 1
+                    continue
+                in_string = False
+            elif char == '"':
+                in_string = True
+                continue
+            elif char in "[{":
+                brackets += char
+                continue
+            elif not brackets or BRACKETS[brackets[-1]] != char:
+                raise ValueError("Unexpected %r at position %d" % (char, match.start()))
+            else:
+                brackets = brackets[:-1]
+            if not brackets:
+                if self._scan is not None and self._scan[0] == start:
+                    self._scan = None
+                return pos
+
+    def _decode_value(self, pos, final):
+        pos = self._skip_whitespace(pos)
+        end = self._value_end(pos, final)
+        # the value is complete, a decoding error is an error of the document
+        value, decoded_end = self._decoder.raw_decode(self._buf, pos)
+        if decoded_end != end:
+            raise ValueError("Invalid JSON value at position %d: %r" % (pos, self._buf[pos:end]))
+        return value, end
+
+    # states
+    def _step_object_start(self, final):
+        self._pos = self._expect(self._pos, "{")
+        self._state = "key"
+        return _NOTHING
+
+    def _step_key(self, final):
+        pos = self._skip_whitespace(self._pos)
+        if self._buf[pos] == "}":
+            raise ValueError("Key %r not found" % self.path[self._level])
+        if self._buf[pos] == ",":
+            pos += 1
+        self._key, self._pos = self._decode_value(pos, final)
+        self._state = "colon"
+        return _NOTHING
+
+    def _step_colon(self, final):
+        self._pos = self._expect(self._pos, ":")
+        if self._key == self.path[self._level]:
+            self._level += 1
+            self._state = "array_start" if self._level == len(self.path) else "object_start"
+        else:
+            self._state = "skip_value"
+        return _NOTHING
+
+    def _step_skip_value(self, final):
+        # the value of any other key
+        _, self._pos = self._decode_value(self._pos, final)
+        self._state = "key"
+        return _NOTHING
+
+    def _step_array_start(self, final):
+        self._pos = self._expect(self._pos, "[")
+        self._state = "first_item"
+        return _NOTHING
+
+    def _step_first_item(self, final):
+        pos = self._skip_whitespace(self._pos)
+        if self._buf[pos] == "]":
+            self._pos = pos + 1
+            self._state = "done"
+            return _NOTHING
+        item, self._pos = self._decode_value(pos, final)
+        self._state = "item"
+        return item
+
+    def _step_item(self, final):
+        pos = self._skip_whitespace(self._pos)
+        if self._buf[pos] == "]":
+            self._pos = pos + 1
+            self._state = "done"
+            return _NOTHING
+        pos = self._expect(pos, ",")
+        item, self._pos = self._decode_value(pos, final)
+        return item
@@ -0,0 +1,199 @@
+import bisect
+import time
+
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .utils import path_template
+
+
+__all__ = ["Histogram", "Metrics"]
+
+
+# seconds, the Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+PHASES = ("wait", "dns", "connect", "ttfb", "body", "serialize", "deserialize", "total")
+
+def status_class(status):
+    """Return "2xx" for 200, "error" if there is no response."""
+    return "%sxx" % (status // 100) if status else "error"
+
+
+class Histogram:
+    """Cumulative histogram of durations with fixed bucket upper bounds."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Init."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Add a value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, percentile):
+        """Return the upper bound of the bucket which contains the percentile (inf for the last bucket)."""
+        if not self.count:
+            return None
+        rank = self.count * percentile / 100
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def cumulative(self):
+        """Return [(upper bound, number of values <= upper bound)], the last bound is inf."""
+        result = []
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            result.append((bound, seen))
+        return result
+
+
+class Metrics:
+    """Request lifecycle metrics: durations per phase in histograms.
+
+    The histograms are keyed by phase, method, status class ("2xx", "error", ...) and
+    path template ("/items/{id}"). Phases:
+
+    wait: waiting for a free connection of the pool
+    dns, connect: resolving the host and opening a new connection
+    ttfb: sending the request until the response headers arrived
+    body: reading the response body
+    serialize, deserialize: encoding the request and decoding the response body
+    total: request start until the response headers arrived
+
+        metrics = Metrics()
+        api = API("https://example.com", metrics=metrics)
+        ...
+        metrics.snapshot()
+        metrics.prometheus()
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, clock=time.monotonic):
+        """Init."""
+        self.buckets = tuple(buckets)
+        self.clock = clock
+        self.histograms = {}
+
+    def observe(self, phase, method, status, path, duration):
+        """Record the duration of a phase of a request."""
+        key = (phase, method, status_class(status), path)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        histogram.observe(duration)
+
+    def path(self, url, template=None):
+        """Return the path template of a request: template or the url path with ids replaced."""
+        if template is not None:
+            return template
+        return path_template(urlsplit(str(url)).path)
+
+    def trace_config(self):
+        """Return the aiohttp TraceConfig which records the network phases.
+
+        The trace_request_ctx of a request is its path template (or None).
+        """
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_queued_start.append(self._on_start("wait"))
+        trace_config.on_connection_queued_end.append(self._on_end("wait"))
+        trace_config.on_dns_resolvehost_start.append(self._on_start("dns"))
+        trace_config.on_dns_resolvehost_end.append(self._on_end("dns"))
+        trace_config.on_connection_create_start.append(self._on_start("connect"))
+        trace_config.on_connection_create_end.append(self._on_end("connect"))
+        trace_config.on_request_headers_sent.append(self._on_start("ttfb"))
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        return trace_config
+
+    def _on_start(self, phase):
+        async def on_start(session, ctx, params):
+            ctx.metrics_started[phase] = self.clock()
+
+        return on_start
+
+    def _on_end(self, phase):
+        async def on_end(session, ctx, params):
+            started = ctx.metrics_started.pop(phase, None)
+            if started is not None:
+                ctx.metrics_durations[phase] = self.clock() - started
+
+        return on_end
+
+    async def _on_request_start(self, session, ctx, params):
+        ctx.metrics_started = {"total": self.clock()}
+        ctx.metrics_durations = {}
+
+    async def _on_request_end(self, session, ctx, params):
+        started = ctx.metrics_started.pop("ttfb", None)
+        if started is not None:
+            ctx.metrics_durations["ttfb"] = self.clock() - started
+        self._record(ctx, params.method, params.url, params.response.status)
+
+    async def _on_request_exception(self, session, ctx, params):
+        self._record(ctx, params.method, params.url, None)
+
+    def _record(self, ctx, method, url, status):
+        path = self.path(url, ctx.trace_request_ctx if isinstance(ctx.trace_request_ctx, str) else None)
+        ctx.metrics_durations["total"] = self.clock() - ctx.metrics_started["total"]
+        for phase, duration in ctx.metrics_durations.items():
+            self.observe(phase, method, status, path, duration)
+
+    def snapshot(self):
+        """Return a list of all histograms as dicts, sorted by path, method, status and phase."""
+        result = []
+        for (phase, method, status, path), histogram in self.histograms.items():
+            result.append({
+                "phase": phase,
+                "method": method,
+                "status": status,
+                "path": path,
+                "count": histogram.count,
+                "sum": histogram.sum,
+                "mean": histogram.sum / histogram.count,
+                "p50": histogram.percentile(50),
+                "p95": histogram.percentile(95),
+                "p99": histogram.percentile(99),
+                "buckets": histogram.cumulative(),
+            })
+        result.sort(key=lambda x: (x["path"], x["method"], x["status"], PHASES.index(x["phase"])))
+        return result
+
+    def prometheus(self, name="aionap_request_duration_seconds"):
+        """Return the histograms in the Prometheus text exposition format."""
+        lines = [
+            "# HELP %s Duration of the phases of HTTP requests." % name,
+            "# TYPE %s histogram" % name,
+        ]
+        for item in self.snapshot():
+            labels = 'phase="%s",method="%s",status="%s",path="%s"' % tuple(
+                escape_label(item[x]) for x in ("phase", "method", "status", "path")
+            )
+            for bound, count in item["buckets"]:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append('%s_bucket{%s,le="%s"} %s' % (name, labels, le, count))
+            lines.append("%s_sum{%s} %r" % (name, labels, item["sum"]))
+            lines.append("%s_count{%s} %s" % (name, labels, item["count"]))
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """Remove all histograms."""
+        self.histograms.clear()
+
+
+def escape_label(value):
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,239 @@
+import asyncio
+
+from urllib.parse import urljoin
+
+from .typed import convert
+
+
+__all__ = [
+    "Pagination",
+    "AutoPagination",
+    "LinkHeaderPagination",
+    "HydraPagination",
+    "CursorPagination",
+    "OffsetPagination",
+]
+
+
+def get_path(content, path):
+    """Return the value of a key (or a sequence of keys) in content or None."""
+    if path is None:
+        return content
+    if isinstance(path, str):
+        path = (path,)
+    for key in path:
+        if not isinstance(content, dict):
+            return None
+        content = content.get(key)
+    return content
+
+
+def set_param(params, name, value):
+    """Return url parameters (list of tuples) with name set to value."""
+    return [(k, v) for k, v in params if k != name] + [(name, value)]
+
+
+class Pagination:
+    """Base class of a pagination scheme.
+
+    A scheme knows how to get the items out of a page and how to request the next page.
+    """
+
+    items_key = None
+
+    def __init__(self, items_key=None):
+        """Init.
+
+        items_key: key (or sequence of keys) of the items in a page, None if the page is a list
+        """
+        if items_key is not None:
+            self.items_key = items_key
+
+    def first_page(self, params):
+        """Return the url parameters of the first page."""
+        return params
+
+    def items(self, content):
+        """Return the items of a page."""
+        return get_path(content, self.items_key) or []
+
+    def next_page(self, resp, content, url, params):
+        """Return (url, params) of the next page or None if this is the last page."""
+        raise NotImplementedError()
+
+
+class LinkHeaderPagination(Pagination):
+    """RFC 5988 'Link: <url>; rel="next"' header."""
+
+    def next_page(self, resp, content, url, params):
+        """."""
+        link = resp.links.get("next")
+        if not link:
+            return None
+        # the link contains all query parameters
+        return urljoin(str(resp.url), str(link["url"])), []
+
+
+class HydraPagination(Pagination):
+    """Hydra collections (hydra:member items and hydra:view/hydra:next link)."""
+
+    items_key = "hydra:member"
+
+    def next_page(self, resp, content, url, params):
+        """."""
+        next_url = get_path(content, ("hydra:view", "hydra:next"))
+        if not next_url:
+            return None
+        return urljoin(str(resp.url), next_url), []
+
+
+class CursorPagination(Pagination):
+    """Cursor token in the response which has to be sent as url parameter for the next page."""
+
+    items_key = "items"
+
+    def __init__(self, items_key=None, cursor_key="next_cursor", cursor_param="cursor"):
+        """Init.
+
+        cursor_key: key (or sequence of keys) of the next cursor in a page
+        cursor_param: url parameter name of the cursor
+        """
+        super().__init__(items_key=items_key)
+        self.cursor_key = cursor_key
+        self.cursor_param = cursor_param
+
+    def next_page(self, resp, content, url, params):
+        """."""
+        cursor = get_path(content, self.cursor_key)
+        if not cursor:
+            return None
+        return url, set_param(params, self.cursor_param, cursor)
+
+
+class OffsetPagination(Pagination):
+    """offset/limit url parameters; a page with less than limit items is the last one."""
+
+    def __init__(self, items_key=None, limit=100, offset_param="offset", limit_param="limit"):
+        """Init."""
+        super().__init__(items_key=items_key)
+        self.limit = limit
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+
+    def _get_int(self, params, name, default):
+        for k, v in params:
+            if k == name:
+                return int(v)
+        return default
+
+    def first_page(self, params):
+        """."""
+        if self.limit_param not in [k for k, _ in params]:
+            params = set_param(params, self.limit_param, self.limit)
+        return params
+
+    def next_page(self, resp, content, url, params):
+        """."""
+        limit = self._get_int(params, self.limit_param, self.limit)
+        if len(self.items(content)) < limit:
+            return None
+        offset = self._get_int(params, self.offset_param, 0)
+        return url, set_param(params, self.offset_param, offset + limit)
+
+
+class AutoPagination(Pagination):
+    """Link header or Hydra pagination, whatever the response provides."""
+
+    def items(self, content):
+        """."""
+        if isinstance(content, dict) and HydraPagination.items_key in content:
+            return HydraPagination().items(content)
+        return super().items(content)
+
+    def next_page(self, resp, content, url, params):
+        """."""
+        return LinkHeaderPagination().next_page(resp, content, url, params) or HydraPagination().next_page(
+            resp, content, url, params
+        )
+
+
+class Paginator:
+    """Async iterator over the items of all pages.
+
+    Up to prefetch pages are fetched in the background while the items of the
+    current page are consumed.
+    """
+
+    def __init__(self, fetch, pagination, url, params, prefetch=1, type=None):
+        """Init.
+
+        fetch: coroutine function (url, params) -> (response, decoded content)
+        type: convert the items into type (a dataclass, NamedTuple, msgspec Struct, ...)
+        """
+        if prefetch < 0:
+            raise ValueError("prefetch must not be negative")
+        self.fetch = fetch
+        self.pagination = pagination
+        self.url = url
+        self.params = pagination.first_page(params)
+        self.prefetch = prefetch
+        self.type = type
+
+    async def pages(self):
+        """Yield the decoded pages."""
+        if not self.prefetch:
+            async for page in self._pages():
+                yield page
+            return
+
+        # a slot per page fetched ahead, freed when the page is taken from the queue
+        slots = asyncio.Semaphore(self.prefetch)
+        queue = asyncio.Queue()
+        producer = asyncio.ensure_future(self._produce(queue, slots))
+        try:
+            while True:
+                page, exc, last = await queue.get()
+                if exc is not None:
+                    raise exc
+                if last:
+                    return
+                slots.release()
+                yield page
+        finally:
+            producer.cancel()
+
+    async def _produce(self, queue, slots):
+        pages = self._pages()
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    page = await pages.__anext__()
+                except StopAsyncIteration:
+                    break
+                queue.put_nowait((page, None, False))
+        except Exception as exc:
+            queue.put_nowait((None, exc, True))
+        else:
+            queue.put_nowait((None, None, True))
+        finally:
+            await pages.aclose()
+
+    async def _pages(self):
+        url, params = self.url, self.params
+        while True:
+            resp, content = await self.fetch(url, params)
+            yield content
+            next_page = self.pagination.next_page(resp, content, url, params)
+            if next_page is None:
+                return
+            url, params = next_page
+
+    async def __aiter__(self):
+        """Yield the items of all pages."""
+        async for page in self.pages():
+            items = self.pagination.items(page)
+            if self.type is not None:
+                items = convert(items, list[self.type])
+            for item in items:
+                yield item
@@ -0,0 +1,109 @@
+import collections
+import time
+
+import aiohttp
+
+
+__all__ = ["PoolStats"]
+
+
+class HostStats:
+    """Connection counters of a host."""
+
+    __slots__ = ("created", "reused", "queued", "wait_time", "max_wait_time")
+
+    def __init__(self):
+        """Init."""
+        self.created = 0
+        self.reused = 0
+        self.queued = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+
+def host_key(host, port):
+    """Return "host:port"."""
+    return "%s:%s" % (host, port)
+
+
+class PoolStats:
+    """Connection pool statistics, collected with aiohttp trace hooks.
+
+    Counts new and reused connections and the time requests waited for a free
+    connection (pool limit reached) per host.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        """Init."""
+        self.clock = clock
+        self.hosts = collections.defaultdict(HostStats)
+
+    def trace_config(self):
+        """Return the aiohttp TraceConfig which feeds the statistics."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_connection_create_end.append(self._on_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_reuseconn)
+        return trace_config
+
+    async def _on_request_start(self, session, ctx, params):
+        ctx.pool_host = host_key(params.url.host, params.url.port)
+
+    async def _on_queued_start(self, session, ctx, params):
+        ctx.pool_queued = self.clock()
+
+    async def _on_queued_end(self, session, ctx, params):
+        stats = self.hosts[ctx.pool_host]
+        wait_time = self.clock() - ctx.pool_queued
+        stats.queued += 1
+        stats.wait_time += wait_time
+        stats.max_wait_time = max(stats.max_wait_time, wait_time)
+
+    async def _on_create_end(self, session, ctx, params):
+        self.hosts[ctx.pool_host].created += 1
+
+    async def _on_reuseconn(self, session, ctx, params):
+        self.hosts[ctx.pool_host].reused += 1
+
+    def snapshot(self, connector):
+        """Return the current state of the pool of connector and the counters, per host and in total."""
+        idle = collections.Counter()
+        acquired = collections.Counter()
+        # aiohttp doesn't expose its pool, this reads the connector's internal state
+        for key, conns in getattr(connector, "_conns", {}).items():
+            idle[host_key(key.host, key.port)] += len(conns)
+        for key, conns in getattr(connector, "_acquired_per_host", {}).items():
+            acquired[host_key(key.host, key.port)] += len(conns)
+
+        hosts = {}
+        for host in sorted(set(idle) | set(acquired) | set(self.hosts)):
+            stats = self.hosts.get(host) or HostStats()
+            hosts[host] = {
+                "open": idle[host] + acquired[host],
+                "idle": idle[host],
+                "acquired": acquired[host],
+                "created": stats.created,
+                "reused": stats.reused,
+                "reuse_ratio": stats.reused / (stats.reused + stats.created) if stats.reused + stats.created else None,
+                "queued": stats.queued,
+                "wait_time": stats.wait_time,
+                "max_wait_time": stats.max_wait_time,
+            }
+
+        created = sum(host["created"] for host in hosts.values())
+        reused = sum(host["reused"] for host in hosts.values())
+        return {
+            "limit": getattr(connector, "limit", None),
+            "limit_per_host": getattr(connector, "limit_per_host", None),
+            "open": sum(host["open"] for host in hosts.values()),
+            "idle": sum(idle.values()),
+            "acquired": sum(acquired.values()),
+            "created": created,
+            "reused": reused,
+            "reuse_ratio": reused / (reused + created) if reused + created else None,
+            "queued": sum(host["queued"] for host in hosts.values()),
+            "wait_time": sum(host["wait_time"] for host in hosts.values()),
+            "hosts": hosts,
+        }
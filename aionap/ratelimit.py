@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+from urllib.parse import urlsplit
+
+from .utils import parse_http_date, path_template as normalize_path
+
+
+__all__ = ["RateLimiter", "TokenBucket"]
+
+
+# X-RateLimit-Reset values above are unix timestamps, below delta seconds
+EPOCH_THRESHOLD = 1e9
+
+
+def parse_retry_after(value, now=None):
+    """Return the delay in seconds of a Retry-After header (delta seconds or http date) or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    retry_at = parse_http_date(value)
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at - (now if now is not None else time.time()))
+
+
+class TokenBucket:
+    """Token bucket: rate tokens per second, at most burst tokens at once."""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        """Init."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate)
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        self.paused_until = 0.0
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+    def reserve(self):
+        """Take a token and return the number of seconds to wait before it may be used."""
+        now = self._refill()
+        self.tokens -= 1
+        # a negative number of tokens are reservations of waiting requests
+        delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(delay, self.paused_until - now)
+
+    def pause(self, seconds):
+        """Don't hand out usable tokens for the next seconds."""
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+class RateLimiter:
+    """Client side rate limiting.
+
+    Requests are delayed before they are sent to stay within rate requests per second
+    (with bursts of up to burst requests). Additionally all requests are paused if the
+    server asks for it with a Retry-After header (429 and 503 responses) or with
+    X-RateLimit-Remaining: 0 and X-RateLimit-Reset.
+
+    scope: "host" (one bucket per host), "path" (one bucket per path template, the template
+           of api.template() or the url path with the ids replaced by {id}) or "global"
+    """
+
+    scopes = ("host", "path", "global")
+
+    def __init__(self, rate, burst=None, scope="host", clock=time.monotonic):
+        """Init."""
+        if scope not in self.scopes:
+            raise ValueError("scope must be one of %s" % ", ".join(self.scopes))
+        # validate rate and burst early
+        TokenBucket(rate, burst)
+        self.rate = rate
+        self.burst = burst
+        self.scope = scope
+        self.clock = clock
+        self._buckets = {}
+
+    def key(self, url, path_template=None):
+        """Bucket key of url."""
+        if self.scope == "global":
+            return None
+        parts = urlsplit(url)
+        if self.scope == "host":
+            return parts.netloc
+        return parts.netloc, path_template if path_template is not None else normalize_path(parts.path)
+
+    def bucket(self, url, path_template=None):
+        """Return the token bucket of url."""
+        key = self.key(url, path_template)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst, clock=self.clock)
+        return bucket
+
+    async def wait(self, url, path_template=None):
+        """Wait until a request to url may be sent."""
+        delay = self.bucket(url, path_template).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update(self, url, response, path_template=None):
+        """Pause if the response asks for it."""
+        delay = None
+        if response.status in (429, 503):
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+
+        if delay is None and response.headers.get("X-RateLimit-Remaining", "").strip() == "0":
+            try:
+                reset = float(response.headers.get("X-RateLimit-Reset", ""))
+            except ValueError:
+                reset = None
+            if reset is not None:
+                delay = max(0.0, reset - time.time()) if reset > EPOCH_THRESHOLD else reset
+
+        if delay:
+            self.bucket(url, path_template).pause(delay)
+        return delay
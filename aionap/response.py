@@ -0,0 +1,120 @@
+__all__ = ["LazyResponse", "StreamResponse"]
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class StreamResponse:
+    """Async iterator over the body of a response, chunk by chunk.
+
+    The body is never read into memory as a whole. The connection is released
+    as soon as the body is exhausted; use it as an async context manager to
+    release it as well when the iteration stops early:
+
+        async with await api.export.stream() as stream:
+            async for chunk in stream:
+                ...
+    """
+
+    def __init__(self, response, chunk_size=DEFAULT_CHUNK_SIZE, on_release=None):
+        """Init.
+
+        on_release: callable() called once when the connection is released
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        self.response = response
+        self.chunk_size = chunk_size
+        self._on_release = on_release
+
+    @property
+    def status(self):
+        """HTTP status code."""
+        return self.response.status
+
+    @property
+    def headers(self):
+        """HTTP response headers."""
+        return self.response.headers
+
+    def __aiter__(self):
+        """Async iterator."""
+        return self
+
+    async def __anext__(self):
+        """Next body chunk."""
+        chunk = await self.response.content.read(self.chunk_size)
+        if not chunk:
+            self.release()
+            raise StopAsyncIteration
+        return chunk
+
+    def release(self):
+        """Release the underlying connection."""
+        self.response.release()
+        on_release, self._on_release = self._on_release, None
+        if on_release is not None:
+            on_release()
+
+    async def __aenter__(self):
+        """Asyncio with enter."""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Asyncio with exit."""
+        self.release()
+
+
+class LazyResponse:
+    """Response whose body is read and decoded only when it is accessed.
+
+    Status and headers are available right away. If the body isn't needed, release
+    the connection (or use it as an async context manager):
+
+        async with await api.items.as_lazy().post(data) as resp:
+            if resp.status == 201:
+                location = resp.headers["Location"]
+    """
+
+    def __init__(self, response, decode):
+        """Init.
+
+        decode: coroutine function (response) -> decoded content
+        """
+        self.response = response
+        self._decode = decode
+        self._data = None
+        self._decoded = False
+
+    @property
+    def status(self):
+        """HTTP status code."""
+        return self.response.status
+
+    @property
+    def headers(self):
+        """HTTP response headers."""
+        return self.response.headers
+
+    async def content(self):
+        """Return the body as bytes, it is read on the first call."""
+        return await self.response.read()
+
+    async def data(self):
+        """Return the decoded body, it is read and decoded on the first call."""
+        if not self._decoded:
+            self._data = await self._decode(self.response)
+            self._decoded = True
+        return self._data
+
+    def release(self):
+        """Release the underlying connection, an unread body is discarded."""
+        self.response.release()
+
+    async def __aenter__(self):
+        """Asyncio with enter."""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Asyncio with exit."""
+        self.release()
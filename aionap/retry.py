@@ -0,0 +1,66 @@
+import asyncio
+import random
+
+import aiohttp
+
+from .ratelimit import parse_retry_after
+
+
+__all__ = ["RetryPolicy"]
+
+
+class RetryPolicy:
+    """When and how often to retry a failed request.
+
+    Failed attempts are retried after an exponential backoff
+    (backoff * 2 ** (attempt - 1), at most max_backoff seconds) with full jitter.
+    A Retry-After header of the response overrides a shorter backoff.
+
+    max_attempts: maximal number of attempts (1 disables retries)
+    statuses: response status codes to retry
+    exceptions: exception classes to retry (connection errors and timeouts by default)
+    methods: HTTP methods to retry; other methods (POST, PATCH) are only retried if the
+             request is marked as idempotent, e.g. api.items(idempotent=True).post(...)
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff=0.1,
+        max_backoff=10.0,
+        jitter=True,
+        statuses=(502, 503, 504),
+        exceptions=(aiohttp.ClientConnectionError, asyncio.TimeoutError),
+        methods=("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+    ):
+        """Init."""
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.exceptions = tuple(exceptions)
+        self.methods = frozenset(m.upper() for m in methods)
+
+    def is_retryable(self, method, attempt, status=None, exception=None, idempotent=False):
+        """Return True if the attempt failed and can be retried."""
+        if attempt >= self.max_attempts:
+            return False
+        if not idempotent and method.upper() not in self.methods:
+            return False
+        if exception is not None:
+            return isinstance(exception, self.exceptions)
+        return status in self.statuses
+
+    def delay(self, attempt, response=None):
+        """Seconds to wait before the next attempt."""
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
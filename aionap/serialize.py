@@ -1,8 +1,15 @@
+import functools
+import math
+import re
+
 from . import exceptions
+from .typed import convert
 
 SERIALIZERS = {
     "json": True,
     "yaml": True,
+    "msgpack": True,
+    "cbor": True,
 }
 
 try:
@@ -15,11 +22,184 @@ try:
 except ImportError:
     SERIALIZERS["yaml"] = False
 
+try:
+    import msgpack
+except ImportError:
+    SERIALIZERS["msgpack"] = False
+
+try:
+    import cbor2
+except ImportError:
+    SERIALIZERS["cbor"] = False
+
+# JSON backends: name -> (loads, dumps to bytes)
+# the optional backends fall back to the stdlib json module for values they can't
+# handle exactly, so all backends read and write the same documents
+JSON_BACKENDS = {}
+# the default backend is the first installed one
+JSON_BACKEND_PREFERENCE = ("msgspec", "orjson", "ujson", "json")
+
+# a number which may not fit into 64 bits
+LONG_NUMBER = re.compile(rb"\d{19}")
+LONG_NUMBER_STR = re.compile(r"\d{19}")
+
+
+def has_non_finite_float(data):
+    """Return True if data contains NaN or (-)Infinity, which the optional backends write as null."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+if SERIALIZERS["json"]:
+
+    def json_dumps(data):
+        """."""
+        return json.dumps(data).encode("utf-8")
+
+    JSON_BACKENDS["json"] = (json.loads, json_dumps)
+
+try:
+    import orjson
+except ImportError:
+    pass
+else:
+
+    def orjson_loads(data):
+        """."""
+        if (LONG_NUMBER if isinstance(data, bytes) else LONG_NUMBER_STR).search(data):
+            # orjson reads integers above 64 bits as floats
+            return json.loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN, Infinity or out of range numbers
+            return json.loads(data)
+
+    def orjson_dumps(data):
+        """."""
+        try:
+            result = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # integers above 64 bits
+            return json_dumps(data)
+        if b"null" in result and has_non_finite_float(data):
+            return json_dumps(data)
+        return result
+
+    JSON_BACKENDS["orjson"] = (orjson_loads, orjson_dumps)
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+else:
+
+    def msgspec_loads(data):
+        """."""
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError:
+            # NaN or Infinity
+            return json.loads(data)
+
+    def msgspec_dumps(data):
+        """."""
+        try:
+            result = msgspec.json.encode(data)
+        except TypeError:
+            return json_dumps(data)
+        if b"null" in result and has_non_finite_float(data):
+            return json_dumps(data)
+        return result
+
+    JSON_BACKENDS["msgspec"] = (msgspec_loads, msgspec_dumps)
+
+try:
+    import ujson
+except ImportError:
+    pass
+else:
+
+    def ujson_loads(data):
+        """."""
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            return json.loads(data)
+
+    def ujson_dumps(data):
+        """."""
+        try:
+            return ujson.dumps(data).encode("utf-8")
+        except (TypeError, OverflowError):
+            return json_dumps(data)
+
+    JSON_BACKENDS["ujson"] = (ujson_loads, ujson_dumps)
+
+
+UTF8_CHARSETS = ("utf-8", "utf8")
+
+
+@functools.lru_cache(maxsize=256)
+def msgspec_decoder(protocol, type):
+    """Return a (cached) msgspec decoder of protocol ("json" or "msgpack") for type."""
+    return getattr(msgspec, protocol).Decoder(type)
+
+
+def msgspec_decode(protocol, data, type):
+    """Decode data into type in one pass, raise ValidationError like convert()."""
+    try:
+        return msgspec_decoder(protocol, type).decode(data)
+    except msgspec.ValidationError as exc:
+        raise exceptions.ValidationError(str(exc)) from exc
+
+
+@functools.lru_cache(maxsize=256)
+def parse_content_type(value):
+    """Split a Content-Type header value into (media type, structured syntax suffix, charset).
+
+    "application/problem+json; charset=UTF-8" -> ("application/problem+json", "json", "utf-8")
+    """
+    media_type, _, params = value.partition(";")
+    media_type = media_type.strip().lower()
+
+    charset = None
+    for param in params.split(";"):
+        name, _, param_value = param.partition("=")
+        if name.strip().lower() == "charset":
+            charset = param_value.strip().strip('"').lower() or None
+
+    _, plus, suffix = media_type.rpartition("+")
+    return media_type, suffix if plus else None, charset
+
+
+def decode(serializer, data, charset=None, type=None):
+    """Decode data (bytes) with serializer, into type if it isn't None.
+
+    A module level function, so it can run in a process pool.
+    """
+    if charset is not None and charset not in UTF8_CHARSETS:
+        data = data.decode(charset)
+    if type is not None:
+        return serializer.loads_as(data, type)
+    return serializer.loads(data)
+
 
 class BaseSerializer:
     """Base Serializer."""
 
     content_types = None
+    # structured syntax suffixes, e.g. "json" for application/vnd.foo+json
+    suffixes = ()
     key = None
 
     def get_content_type(self):
@@ -32,13 +212,27 @@ class BaseSerializer:
         """."""
         raise NotImplementedError()
 
+    def loads_as(self, data, type):
+        """Decode data into type (a dataclass, NamedTuple, msgspec Struct, list[Item], ...).
+
+        Raises ValidationError if data doesn't match type.
+        """
+        return convert(self.loads(data), type)
+
     def dumps(self, data):
         """."""
         raise NotImplementedError()
 
 
 class JsonSerializer(BaseSerializer):
-    """JSON."""
+    """JSON.
+
+    Uses the fastest installed backend (msgspec, orjson, ujson or the stdlib json
+    module) unless a backend is given. The optional backends fall back to the json
+    module for the values they can't handle exactly (non-str keys, integers above 64
+    bits, NaN and Infinity), so every backend reads and writes the same documents as
+    the json module. dumps returns bytes.
+    """
 
     content_types = [
         "application/json",
@@ -47,15 +241,31 @@ class JsonSerializer(BaseSerializer):
         "text/x-javascript",
         "text/x-json",
     ]
+    suffixes = ("json",)
     key = "json"
 
+    def __init__(self, backend=None):
+        """Init."""
+        if backend is None:
+            backend = next((name for name in JSON_BACKEND_PREFERENCE if name in JSON_BACKENDS), "json")
+        if backend not in JSON_BACKENDS:
+            raise exceptions.SerializerNotAvailable("%s is not an available JSON backend" % backend)
+        self.backend = backend
+        self._loads, self._dumps = JSON_BACKENDS[backend]
+
     def loads(self, data):
         """."""
-        return json.loads(data)
+        return self._loads(data)
+
+    def loads_as(self, data, type):
+        """Decode data into type, in one pass if msgspec is installed."""
+        if msgspec is None:
+            return super().loads_as(data, type)
+        return msgspec_decode("json", data, type)
 
     def dumps(self, data):
         """."""
-        return json.dumps(data)
+        return self._dumps(data)
 
 
 class YamlSerializer(BaseSerializer):
@@ -67,27 +277,78 @@ class YamlSerializer(BaseSerializer):
         'application/yaml',
         'application/x-yaml',
     ]
+    suffixes = ("yaml",)
     key = "yaml"
 
     def loads(self, data):
         """."""
-        return yaml.safe_load(str(data))
+        return yaml.safe_load(data)
 
     def dumps(self, data):
         """."""
         return yaml.dump(data)
 
 
+class MsgpackSerializer(BaseSerializer):
+    """MessagePack."""
+
+    content_types = [
+        "application/msgpack",
+        "application/x-msgpack",
+        "application/vnd.msgpack",
+    ]
+    suffixes = ("msgpack",)
+    key = "msgpack"
+
+    def loads(self, data):
+        """."""
+        return msgpack.unpackb(data, raw=False)
+
+    def loads_as(self, data, type):
+        """Decode data into type, in one pass if msgspec is installed."""
+        if msgspec is None:
+            return super().loads_as(data, type)
+        return msgspec_decode("msgpack", data, type)
+
+    def dumps(self, data):
+        """."""
+        return msgpack.packb(data, use_bin_type=True)
+
+
+class CborSerializer(BaseSerializer):
+    """CBOR."""
+
+    content_types = [
+        "application/cbor",
+    ]
+    suffixes = ("cbor",)
+    key = "cbor"
+
+    def loads(self, data):
+        """."""
+        return cbor2.loads(data)
+
+    def dumps(self, data):
+        """."""
+        return cbor2.dumps(data)
+
+
 class Serializer:
     """Automatically serialize content by content type."""
 
-    def __init__(self, default=None, serializers=None):
-        """Init."""
+    def __init__(self, default=None, serializers=None, json_backend=None):
+        """Init.
+
+        json_backend: JSON backend ("msgspec", "orjson", "ujson" or "json"), default: fastest installed one
+        """
         if default is None:
             default = "json" if SERIALIZERS["json"] else "yaml"
 
         if serializers is None:
-            serializers = [x() for x in [JsonSerializer, YamlSerializer] if SERIALIZERS[x.key]]
+            serializers = []
+            if SERIALIZERS["json"]:
+                serializers.append(JsonSerializer(backend=json_backend))
+            serializers += [x() for x in [YamlSerializer, MsgpackSerializer, CborSerializer] if SERIALIZERS[x.key]]
 
         if not serializers:
             raise exceptions.SerializerNoAvailable("There are no Available Serializers.")
@@ -99,6 +360,15 @@ class Serializer:
 
         self.default = default
 
+        # media type and suffix -> serializer, the first registered serializer wins
+        self._content_types = {}
+        self._suffixes = {}
+        for serializer in self.serializers.values():
+            for ctype in serializer.content_types:
+                self._content_types.setdefault(ctype, serializer)
+            for suffix in serializer.suffixes:
+                self._suffixes.setdefault(suffix, serializer)
+
     def get_serializer(self, name=None, content_type=None):
         """."""
         if name is None and content_type is None:
@@ -108,11 +378,13 @@ class Serializer:
                 raise exceptions.SerializerNotAvailable("%s is not an available serializer" % name)
             return self.serializers[name]
         else:
-            for x in self.serializers.values():
-                for ctype in x.content_types:
-                    if content_type == ctype:
-                        return x
-            raise exceptions.SerializerNotAvailable("%s is not an available serializer" % content_type)
+            media_type, suffix, _ = parse_content_type(content_type)
+            serializer = self._content_types.get(media_type)
+            if serializer is None and suffix is not None:
+                serializer = self._suffixes.get(suffix)
+            if serializer is None:
+                raise exceptions.SerializerNotAvailable("%s is not an available serializer" % content_type)
+            return serializer
 
     def loads(self, data, format=None):
         """."""
@@ -124,7 +396,18 @@ class Serializer:
         s = self.get_serializer(format)
         return s.dumps(data)
 
+    def loads_as(self, data, type, format=None):
+        """."""
+        s = self.get_serializer(format)
+        return s.loads_as(data, type)
+
     def get_content_type(self, format=None):
         """."""
         s = self.get_serializer(format)
         return s.get_content_type()
+
+    def get_accept(self, format=None):
+        """Accept header value: the content type of format first, all others with a lower quality."""
+        preferred = self.get_serializer(format)
+        others = ["%s;q=0.5" % x.get_content_type() for x in self.serializers.values() if x is not preferred]
+        return ", ".join([preferred.get_content_type()] + others)
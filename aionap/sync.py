@@ -0,0 +1,208 @@
+import asyncio
+import threading
+
+from . import API, Resource
+
+
+__all__ = ["LoopThread", "SyncAPI", "SyncResource"]
+
+
+class LoopThread:
+    """Event loop which runs forever in a daemon thread.
+
+    Coroutines are submitted from any other thread with run(), which blocks until
+    the result is available.
+    """
+
+    def __init__(self, name="aionap-loop"):
+        """Init."""
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_forever, name=name, daemon=True)
+        self.thread.start()
+
+    def _run_forever(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro, timeout=None):
+        """Run coro on the loop and return its result."""
+        if threading.current_thread() is self.thread:
+            coro.close()
+            raise RuntimeError("A synchronous call can't be made from the event loop thread, use the API instead")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # timeout or KeyboardInterrupt: don't leave the request running
+            future.cancel()
+            raise
+
+    def stop(self):
+        """Stop the loop and wait for the thread."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+_default_loop_thread = None
+_default_loop_thread_lock = threading.Lock()
+
+
+def get_loop_thread():
+    """Return the LoopThread shared by all SyncAPI instances, start it on first use."""
+    global _default_loop_thread
+    with _default_loop_thread_lock:
+        if _default_loop_thread is None:
+            _default_loop_thread = LoopThread()
+        return _default_loop_thread
+
+
+async def _anext(iterator):
+    return await iterator.__anext__()
+
+
+class SyncAttributesMixin:
+    """Attribute access to the child resources of the wrapped API or Resource as SyncResources."""
+
+    __slots__ = ("_resource", "_loop_thread", "_timeout")
+
+    def __init__(self, resource, loop_thread, timeout=None):
+        """Init."""
+        self._resource = resource
+        self._loop_thread = loop_thread
+        self._timeout = timeout
+
+    def __getattr__(self, item):
+        if item.startswith("_"):
+            raise AttributeError(item)
+        resource = getattr(self._resource, item)
+        if not isinstance(resource, Resource):
+            # e.g. stream() or as_lazy(), their results are async
+            raise AttributeError("%s isn't available synchronously" % item)
+        return self._wrap(resource)
+
+    def _wrap(self, resource):
+        return SyncResource(resource, self._loop_thread, self._timeout)
+
+    def _run(self, coro):
+        return self._loop_thread.run(coro, timeout=self._timeout)
+
+    def _iterate(self, iterable):
+        iterator = iterable.__aiter__()
+        try:
+            while True:
+                try:
+                    yield self._run(_anext(iterator))
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._run(iterator.aclose())
+
+
+class SyncResource(SyncAttributesMixin):
+    """Blocking facade of a Resource, the requests run on the loop of a LoopThread."""
+
+    __slots__ = ()
+
+    def __call__(self, *args, **kwargs):
+        """See Resource.__call__."""
+        return self._wrap(self._resource(*args, **kwargs))
+
+    def __repr__(self):
+        """Repr."""
+        return "<%s %s>" % (self.__class__.__name__, self.url)
+
+    @property
+    def url(self):
+        """Return url."""
+        return self._resource.url
+
+    def as_raw(self):
+        """See Resource.as_raw."""
+        return self._wrap(self._resource.as_raw())
+
+    def get(self, headers=None, **kwargs):
+        """GET request."""
+        return self._run(self._resource.get(headers=headers, **kwargs))
+
+    def post(self, data=None, file=None, headers=None, **kwargs):
+        """POST."""
+        return self._run(self._resource.post(data=data, file=file, headers=headers, **kwargs))
+
+    def patch(self, data=None, file=None, headers=None, **kwargs):
+        """PATCH."""
+        return self._run(self._resource.patch(data=data, file=file, headers=headers, **kwargs))
+
+    def put(self, data=None, file=None, headers=None, **kwargs):
+        """PUT."""
+        return self._run(self._resource.put(data=data, file=file, headers=headers, **kwargs))
+
+    def delete(self, headers=None, **kwargs):
+        """DELETE."""
+        return self._run(self._resource.delete(headers=headers, **kwargs))
+
+    def get_many(self, ids, concurrency=None, headers=None, **kwargs):
+        """See Resource.get_many."""
+        return self._run(self._resource.get_many(ids, concurrency=concurrency, headers=headers, **kwargs))
+
+    def download(self, path, *args, **kwargs):
+        """See Resource.download."""
+        return self._run(self._resource.download(path, *args, **kwargs))
+
+    def paginate(self, *args, **kwargs):
+        """Iterate over the items of all pages, see Resource.paginate."""
+        return self._iterate(self._resource.paginate(*args, **kwargs))
+
+    def aiter_items(self, *args, **kwargs):
+        """Iterate over the items of a JSON array while it is downloaded, see Resource.aiter_items."""
+        return self._iterate(self._resource.aiter_items(*args, **kwargs))
+
+
+class SyncAPI(SyncAttributesMixin):
+    """Blocking facade of an API for synchronous code (WSGI workers, task queues, ...).
+
+    All requests of all SyncAPI instances run on one long-lived event loop in a
+    background thread, so connections are pooled and kept alive between calls and
+    many threads can make requests concurrently:
+
+        api = SyncAPI("https://example.com", max_concurrency=50)
+        items = api.items.get()
+
+    The arguments are those of API. timeout: seconds to wait for the result of a call.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, timeout=None, loop_thread=None, **kwargs):
+        """Init."""
+        loop_thread = loop_thread or get_loop_thread()
+
+        async def create():
+            # the session has to be created on the loop
+            return API(*args, **kwargs)
+
+        super().__init__(loop_thread.run(create()), loop_thread, timeout)
+
+    def __enter__(self):
+        """With enter."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        """With exit."""
+        self.close()
+
+    def close(self):
+        """Close underlying session."""
+        self._run(self._resource.close())
+
+    def template(self, template):
+        """Return a template whose resources are SyncResources, see API.template."""
+        template = self._resource.template(template)
+        return lambda **values: self._wrap(template(**values))
+
+    def pool_stats(self):
+        """See API.pool_stats."""
+        return self._run(self._pool_stats())
+
+    async def _pool_stats(self):
+        return self._resource.pool_stats()
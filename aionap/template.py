@@ -0,0 +1,62 @@
+import string
+
+from urllib.parse import quote
+
+from .utils import join_segment
+
+
+__all__ = ["ResourceTemplate"]
+
+
+class ResourceTemplate:
+    """Precompiled url template, e.g. api.template("/tenants/{tenant}/items/{id}").
+
+    Calling the template with values for all placeholders returns the resource
+    (template(tenant="acme", id=42).get()). The values are percent-encoded and the url
+    is built by plain string formatting; the url is parsed only once, when the
+    template is created.
+    """
+
+    __slots__ = ("template", "fields", "_format", "_factory")
+
+    def __init__(self, template, base_url, factory, append_slash=False):
+        """Init.
+
+        factory: callable(url) which returns a resource for an url
+        """
+        self.template = template
+        self._factory = factory
+
+        fields = []
+        parts = []
+        for literal, field, spec, conversion in string.Formatter().parse(template.lstrip("/")):
+            parts.append(literal.replace("%", "%%"))
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError("Invalid placeholder {%s} in template %r" % (field, template))
+            fields.append(field)
+            parts.append("%%(%s)s" % field)
+        self.fields = frozenset(fields)
+
+        # the base url is part of the format string too, e.g. http://localhost/my%20api
+        url = join_segment(base_url.replace("%", "%%"), "".join(parts))
+        if append_slash and not url.endswith("/"):
+            url += "/"
+        self._format = url
+
+    def url(self, **values):
+        """Return the url for values."""
+        if values.keys() != self.fields:
+            missing = ", ".join(sorted(self.fields - values.keys()))
+            unknown = ", ".join(sorted(values.keys() - self.fields))
+            raise TypeError("Template %r: missing values: %s unknown values: %s" % (self.template, missing, unknown))
+        return self._format % {k: quote("%s" % v, safe="") for k, v in values.items()}
+
+    def __call__(self, **values):
+        """Return the resource for values."""
+        return self._factory(self.url(**values))
+
+    def __repr__(self):
+        """Repr."""
+        return "<ResourceTemplate %r>" % self.template
@@ -0,0 +1,169 @@
+import builtins
+import dataclasses
+import functools
+import types
+import typing
+
+from . import exceptions
+
+
+__all__ = ["convert"]
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+NoneType = builtins.type(None)
+UNION_TYPES = (typing.Union, getattr(types, "UnionType", typing.Union))
+
+
+def convert(data, type):
+    """Convert decoded data (dicts, lists, ...) into type.
+
+    type: a dataclass, NamedTuple (from an array), msgspec Struct or a generic such
+          as list[Item], nested types are converted as well
+
+    Raises ValidationError if data doesn't match type, with or without msgspec.
+    """
+    if msgspec is not None:
+        try:
+            return msgspec.convert(data, type)
+        except msgspec.ValidationError as exc:
+            raise exceptions.ValidationError(str(exc)) from exc
+    return _converter(type)(data)
+
+
+def _type_name(type):
+    return getattr(type, "__name__", None) or repr(type)
+
+
+def _error(expected, data, path):
+    return exceptions.ValidationError("Expected `%s`, got `%s` - at `%s`" % (
+        expected, data.__class__.__name__, path,
+    ))
+
+
+def _scalar(type, accepted):
+    def convert(data, path="$"):
+        if not isinstance(data, accepted) or (isinstance(data, bool) and type is not bool):
+            raise _error(_type_name(type), data, path)
+        return type(data) if type is float else data
+
+    return convert
+
+
+SCALARS = {
+    bool: _scalar(bool, bool),
+    int: _scalar(int, int),
+    float: _scalar(float, (int, float)),
+    str: _scalar(str, str),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _converter(type):
+    """Return a function (data, path="$") which converts decoded data into type (without msgspec).
+
+    Validates like msgspec.convert: wrong types and missing fields raise ValidationError.
+    """
+    origin = typing.get_origin(type)
+    args = typing.get_args(type)
+
+    if type in SCALARS:
+        return SCALARS[type]
+
+    if type is NoneType or type is None:
+
+        def convert_none(data, path="$"):
+            if data is not None:
+                raise _error("null", data, path)
+            return None
+
+        return convert_none
+
+    if type in (list, tuple, set, frozenset, dict):
+        origin, args = type, ()
+
+    if origin in (list, tuple, set, frozenset):
+        if origin is tuple and args and not (len(args) == 2 and args[1] is Ellipsis):
+            converters = [_converter(arg) for arg in args]
+
+            def convert_tuple(data, path="$"):
+                if not isinstance(data, (list, tuple)) or len(data) != len(converters):
+                    raise _error("array of length %s" % len(converters), data, path)
+                return tuple(c(x, "%s[%s]" % (path, i)) for i, (c, x) in enumerate(zip(converters, data)))
+
+            return convert_tuple
+        item = _converter(args[0]) if args else _any
+
+        def convert_array(data, path="$"):
+            if not isinstance(data, (list, tuple)):
+                raise _error("array", data, path)
+            return origin(item(x, "%s[%s]" % (path, i)) for i, x in enumerate(data))
+
+        return convert_array
+
+    if origin is dict:
+        value = _converter(args[1]) if args else _any
+
+        def convert_object(data, path="$"):
+            if not isinstance(data, dict):
+                raise _error("object", data, path)
+            return {k: value(v, "%s[...]" % path) for k, v in data.items()}
+
+        return convert_object
+
+    if origin in UNION_TYPES:
+        converters = [_converter(arg) for arg in args]
+
+        def convert_union(data, path="$"):
+            for converter in converters:
+                try:
+                    return converter(data, path)
+                except exceptions.ValidationError:
+                    pass
+            raise _error(" | ".join(_type_name(arg) for arg in args), data, path)
+
+        return convert_union
+
+    if isinstance(type, builtins.type) and issubclass(type, tuple) and hasattr(type, "_fields"):
+        # NamedTuples are encoded as arrays
+        hints = typing.get_type_hints(type)
+        converters = [_converter(hints.get(name, typing.Any)) for name in type._fields]
+        required = len(type._fields) - len(type._field_defaults)
+
+        def convert_named_tuple(data, path="$"):
+            if not isinstance(data, (list, tuple)) or not required <= len(data) <= len(converters):
+                raise _error("array of length %s" % len(converters), data, path)
+            return type(*[c(x, "%s[%s]" % (path, i)) for i, (c, x) in enumerate(zip(converters, data))])
+
+        return convert_named_tuple
+
+    if dataclasses.is_dataclass(type):
+        hints = typing.get_type_hints(type)
+        fields = {
+            field.name: _converter(hints.get(field.name, typing.Any))
+            for field in dataclasses.fields(type) if field.init
+        }
+        required = [
+            field.name for field in dataclasses.fields(type)
+            if field.init and field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING
+        ]
+
+        def build(data, path="$"):
+            if not isinstance(data, dict):
+                raise _error("object", data, path)
+            for name in required:
+                if name not in data:
+                    raise exceptions.ValidationError("Object missing required field `%s` - at `%s`" % (name, path))
+            # unknown keys are ignored, like msgspec does
+            return type(**{k: fields[k](v, "%s.%s" % (path, k)) for k, v in data.items() if k in fields})
+
+        return build
+
+    return _any
+
+
+def _any(data, path="$"):
+    return data
@@ -0,0 +1,147 @@
+import asyncio
+import mmap
+import os
+
+import aiohttp
+
+from .response import DEFAULT_CHUNK_SIZE
+
+
+__all__ = ["Multipart", "Upload"]
+
+
+class UploadPayload(aiohttp.payload.AsyncIterablePayload):
+    """aiohttp payload of an Upload, with a Content-Length if the size is known."""
+
+    def __init__(self, upload, **kwargs):
+        """Init."""
+        super().__init__(upload.chunks(), content_type=upload.content_type, filename=upload.filename, **kwargs)
+        self._upload_size = upload.size
+
+    @property
+    def size(self):
+        """."""
+        return self._upload_size
+
+
+class Upload:
+    """Request body which is streamed from source instead of read into memory.
+
+    source: a file path (sent memory-mapped), a binary file object, bytes, an
+            async iterable or an iterable of bytes chunks
+    size: body size in bytes, default: the size of a file or bytes, bodies of
+          unknown size are sent with chunked transfer encoding
+    progress: callable(sent bytes, total bytes or None) called after each chunk
+
+        await api.artifacts.put(file=Upload("build.tar", progress=print))
+    """
+
+    def __init__(
+        self, source, content_type="application/octet-stream", filename=None, size=None,
+        chunk_size=DEFAULT_CHUNK_SIZE, progress=None,
+    ):
+        """Init."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        if isinstance(source, (str, os.PathLike)):
+            source = os.fspath(source)
+            if filename is None:
+                filename = os.path.basename(source)
+            if size is None:
+                size = os.path.getsize(source)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            if size is None:
+                size = len(source)
+        elif not hasattr(source, "read") and not hasattr(source, "__aiter__") and not hasattr(source, "__iter__"):
+            raise TypeError("Unsupported upload source %r" % source)
+
+        self.source = source
+        self.content_type = content_type
+        self.filename = filename
+        self.size = size
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+    async def chunks(self):
+        """Yield the body chunk by chunk and report the progress."""
+        sent = 0
+        async for chunk in self._read():
+            yield chunk
+            sent += len(chunk)
+            if self.progress is not None:
+                self.progress(sent, self.size)
+
+    async def _read(self):
+        source = self.source
+        if isinstance(source, str):
+            async for chunk in self._read_mmap(source):
+                yield chunk
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            view = memoryview(source)
+            for start in range(0, len(view), self.chunk_size):
+                yield view[start:start + self.chunk_size]
+        elif hasattr(source, "__aiter__"):
+            async for chunk in source:
+                yield chunk
+        elif hasattr(source, "read"):
+            loop = asyncio.get_running_loop()
+            while True:
+                # don't block the event loop with file IO
+                chunk = await loop.run_in_executor(None, source.read, self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            for chunk in source:
+                yield chunk
+
+    async def _read_mmap(self, path):
+        with open(path, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                # the pages are mapped on demand, the file is never copied into memory as a whole
+                view = memoryview(mm)
+                for start in range(0, len(view), self.chunk_size):
+                    yield view[start:start + self.chunk_size]
+                del view
+            finally:
+                try:
+                    mm.close()
+                except BufferError:
+                    # a chunk is still referenced, the map is closed when it is collected
+                    pass
+
+    def payload(self):
+        """Return the aiohttp payload."""
+        return UploadPayload(self)
+
+
+class Multipart:
+    """multipart/form-data body with form fields and several files.
+
+    files: dict of field name -> Upload or binary file object
+
+        files = {"a": Upload("a.log"), "b": Upload("b.log")}
+        await api.upload.post(file=Multipart(fields={"kind": "log"}, files=files))
+    """
+
+    def __init__(self, fields=None, files=None):
+        """Init."""
+        self.fields = dict(fields or {})
+        self.files = dict(files or {})
+
+    def payload(self):
+        """Return the aiohttp payload."""
+        writer = aiohttp.MultipartWriter("form-data")
+        for name, value in self.fields.items():
+            part = writer.append("%s" % value)
+            part.set_content_disposition("form-data", name=name)
+        for name, file in self.files.items():
+            if not isinstance(file, Upload):
+                filename = getattr(file, "name", None)
+                file = Upload(file, filename=os.path.basename(filename) if isinstance(filename, str) else name)
+            part = writer.append_payload(file.payload())
+            part.set_content_disposition("form-data", name=name, filename=file.filename or name)
+        return writer
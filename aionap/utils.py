@@ -1,10 +1,18 @@
 
+import functools
 import posixpath
+import re
 
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlsplit
 from urllib.parse import urlunsplit
 
 
+ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{16,})$", re.IGNORECASE
+)
+
+
 def urljoin(base, *args):
     """Helper function to join an arbitrary number of url segments together."""
     scheme, netloc, path, query, fragment = urlsplit(base)
@@ -13,6 +21,20 @@ def urljoin(base, *args):
     return urlunsplit([scheme, netloc, path, query, fragment])
 
 
+def join_segment(base, segment):
+    """Append a single path segment to base.
+
+    Same as urljoin(base, segment) but without splitting and rebuilding the url
+    in the common case.
+    """
+    segment = "%s" % segment
+    if segment.startswith("/") or "?" in base or "#" in base:
+        return urljoin(base, segment)
+    if base.endswith("/"):
+        return base + segment
+    return base + "/" + segment
+
+
 def transform_url_parameters(params):
     """Transform python dictionary to aiohttp valid url parameters.
 
@@ -30,3 +52,31 @@ def transform_url_parameters(params):
         else:
             p.append((key, value))
     return p
+
+
+def request_key(url, params=None, headers=None):
+    """Hashable key identifying a request by url, query parameters and headers."""
+    return (
+        url,
+        tuple(params or ()),
+        tuple(sorted((k.lower(), v) for k, v in (headers or {}).items())),
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def path_template(path):
+    """Replace the ids (numbers, UUIDs and long hex strings) in an url path by {id}.
+
+    "/items/42/tags/" -> "/items/{id}/tags/"
+    """
+    return "/".join("{id}" if ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+def parse_http_date(value):
+    """Return a http date header as unix timestamp or None if it can't be parsed."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
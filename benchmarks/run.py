@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+"""aionap benchmarks against an in-process stand-in server.
+
+Measures requests per second and latency percentiles of get, post, pagination and
+streaming for several payload sizes, serializers, concurrency levels and resource
+tree depths and writes the results as JSON:
+
+    $ python benchmarks/run.py --output results.json
+    $ python benchmarks/run.py --baseline results.json --filter get/json
+
+Every scenario is run --repeat times and the medians of the runs are reported.
+With --baseline the medians are compared to an earlier run; the exit code is 1 if
+a scenario got slower than --threshold and than the noise of the runs (the median
+absolute deviation of the repeats, times --noise-factor).
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+FILE_DIR = os.path.dirname(os.path.abspath(__file__))
+# aionap and benchmarks dirs
+sys.path.insert(0, os.path.join(FILE_DIR, ".."))
+sys.path.insert(0, FILE_DIR)
+
+import aiohttp  # noqa
+import aionap  # noqa
+import aionap.serialize  # noqa
+
+from server import PAYLOAD_SIZES, Server  # noqa
+
+FORMATS = [f for f, available in aionap.serialize.SERIALIZERS.items() if available]
+CONCURRENCY = [1, 10, 50]
+DEPTHS = [1, 5, 10]
+
+
+def resource(api, depth):
+    """Return the resource items/level1/.../level<depth - 1>, built by attribute access."""
+    res = api.items
+    for level in range(1, depth):
+        res = getattr(res, "level%s" % level)
+    return res
+
+
+def get(format, size, depth):
+    async def call(api):
+        await resource(api, depth)(format=format).get(size=size)
+
+    return call
+
+
+def post(size):
+    data = [{"id": i, "name": "item-%s" % i, "tags": ["a", "b", "c"]} for i in range(PAYLOAD_SIZES[size])]
+
+    async def call(api):
+        await api.items.post(data)
+
+    return call
+
+
+def paginate(pages):
+    async def call(api):
+        async for _ in api.pages.paginate(pages=pages):
+            pass
+
+    return call
+
+
+def stream(size):
+    async def call(api):
+        async with await api.stream.stream(bytes=size) as response:
+            async for _ in response:
+                pass
+
+    return call
+
+
+def aiter_items():
+    async def call(api):
+        async for _ in api.items.aiter_items(size="large"):
+            pass
+
+    return call
+
+
+def scenarios():
+    """Yield (name, parameters, call)."""
+    for format in FORMATS:
+        for size in PAYLOAD_SIZES:
+            if format == "yaml" and size == "large":
+                # pure Python YAML needs seconds for a large payload
+                continue
+            params = {"verb": "get", "format": format, "size": size, "concurrency": 10, "depth": 1}
+            yield "get/%s/%s/c10" % (format, size), params, get(format, size, 1)
+    for concurrency in CONCURRENCY:
+        for size in ["small", "medium"]:
+            params = {"verb": "get", "format": "json", "size": size, "concurrency": concurrency, "depth": 1}
+            yield "get/concurrency/%s/c%s" % (size, concurrency), params, get("json", size, 1)
+    for depth in DEPTHS:
+        params = {"verb": "get", "format": "json", "size": "small", "concurrency": 10, "depth": depth}
+        yield "get/depth/d%s" % depth, params, get("json", "small", depth)
+    for size in PAYLOAD_SIZES:
+        params = {"verb": "post", "format": "json", "size": size, "concurrency": 10}
+        yield "post/json/%s/c10" % size, params, post(size)
+    yield "paginate/10x100/c1", {"verb": "paginate", "pages": 10, "size": "medium", "concurrency": 1}, paginate(10)
+    for size in [64 * 1024, 16 * 1024 * 1024]:
+        yield "stream/%s/c1" % size, {"verb": "stream", "bytes": size, "concurrency": 1}, stream(size)
+    yield "aiter_items/large/c1", {"verb": "aiter_items", "size": "large", "concurrency": 1}, aiter_items()
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def noise(values):
+    """Relative median absolute deviation of values."""
+    median = statistics.median(values)
+    if not median:
+        return 0.0
+    return statistics.median(abs(value - median) for value in values) / median
+
+
+def summarize(runs):
+    """Return the medians of the results of several runs of a scenario."""
+    result = {
+        "requests": sum(run["requests"] for run in runs),
+        "errors": sum(run["errors"] for run in runs),
+        "elapsed": sum(run["elapsed"] for run in runs),
+        "rps": statistics.median(run["rps"] for run in runs),
+        "repeats": len(runs),
+        "rps_runs": [run["rps"] for run in runs],
+        "noise": {"rps": noise([run["rps"] for run in runs])},
+    }
+    latencies = [run["latency_ms"] for run in runs if "latency_ms" in run]
+    if latencies:
+        result["latency_ms"] = {key: statistics.median(x[key] for x in latencies) for key in latencies[0]}
+        result["noise"]["p99"] = noise([x["p99"] for x in latencies])
+    return result
+
+
+async def measure(url, call, concurrency, duration, warmup, json_backend=None):
+    """Run call with concurrency workers for duration seconds, return the result dict."""
+    latencies = []
+    errors = 0
+
+    serializer = aionap.serialize.Serializer(json_backend=json_backend)
+    async with aionap.API(url, serializer=serializer) as api:
+        # warm up the connection pool and caches
+        await call(api)
+        deadline = time.perf_counter() + warmup
+        while time.perf_counter() < deadline:
+            await call(api)
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    await call(api)
+                except (aionap.exceptions.AioNapBaseException, aiohttp.ClientError):
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    result = {"requests": len(latencies), "errors": errors, "elapsed": elapsed, "rps": len(latencies) / elapsed}
+    if latencies:
+        result["latency_ms"] = {
+            "mean": sum(latencies) / len(latencies) * 1000,
+            "p50": percentile(latencies, 50) * 1000,
+            "p90": percentile(latencies, 90) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": latencies[-1] * 1000,
+        }
+    return result
+
+
+def compare(results, baseline, threshold, noise_factor=3.0):
+    """Print the changes to baseline, return the names of the scenarios which got slower.
+
+    A scenario got slower if the change of its median rps or p99 latency exceeds both
+    threshold and noise_factor times the noise of the runs (of this run or the baseline).
+    """
+    baseline = {x["name"]: x for x in baseline["results"]}
+    regressions = []
+    print("\n%-32s %12s %12s %8s %12s %12s %8s" % ("scenario", "rps", "baseline", "change", "p99 ms", "baseline", "change"))
+    for result in results:
+        base = baseline.get(result["name"])
+        if base is None or "latency_ms" not in result or "latency_ms" not in base:
+            continue
+        rps_change = result["rps"] / base["rps"] - 1 if base["rps"] else 0
+        p99, base_p99 = result["latency_ms"]["p99"], base["latency_ms"]["p99"]
+        p99_change = p99 / base_p99 - 1 if base_p99 else 0
+        noises = [result.get("noise", {}), base.get("noise", {})]
+        rps_limit = max([threshold] + [noise_factor * x.get("rps", 0) for x in noises])
+        p99_limit = max([threshold] + [noise_factor * x.get("p99", 0) for x in noises])
+        slower = rps_change < -rps_limit or p99_change > p99_limit
+        if slower:
+            regressions.append(result["name"])
+        print("%-32s %12.1f %12.1f %+7.1f%% %12.2f %12.2f %+7.1f%%%s" % (
+            result["name"], result["rps"], base["rps"], rps_change * 100, p99, base_p99, p99_change * 100,
+            "  SLOWER" if slower else "",
+        ))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per run of a scenario (default: 2)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scenario, the medians are compared (default: 5)")
+    parser.add_argument("--warmup", type=float, default=0.2, help="warm up seconds per scenario (default: 0.2)")
+    parser.add_argument("--json-backend", default=None, help="JSON backend, e.g. json (default: fastest installed one)")
+    parser.add_argument("--filter", default=None, help="run only scenarios whose name contains this string")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="compare the results to this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slow down (default: 0.1, 10%%)")
+    parser.add_argument(
+        "--noise-factor", type=float, default=3.0,
+        help="a slow down must also exceed this many times the noise of the runs (default: 3)",
+    )
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    results = []
+    with Server() as server:
+        for name, params, call in scenarios():
+            if args.filter and args.filter not in name:
+                continue
+            result = summarize([
+                asyncio.run(measure(
+                    server.url, call, params["concurrency"], args.duration, args.warmup, args.json_backend,
+                ))
+                for _ in range(args.repeat)
+            ])
+            results.append(dict(name=name, params=params, **result))
+            latency = result.get("latency_ms", {})
+            print("%-32s %10.1f req/s  ±%4.1f%%  p50 %8.2f ms  p99 %8.2f ms  errors %s" % (
+                name, result["rps"], result["noise"]["rps"] * 100, latency.get("p50", 0), latency.get("p99", 0),
+                result["errors"],
+            ), flush=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "aiohttp": aiohttp.__version__,
+            "json_backend": aionap.serialize.JsonSerializer(backend=args.json_backend).backend,
+            "duration": args.duration,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold, args.noise_factor)
+        if regressions:
+            print("\n%s scenario(s) got slower: %s" % (len(regressions), ", ".join(regressions)))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""In-process stand-in server for the benchmarks."""
+
+import asyncio
+import functools
+import socket
+import threading
+
+from aiohttp import web
+
+from aionap.serialize import Serializer
+
+# number of items of a payload
+PAYLOAD_SIZES = {
+    "small": 1,
+    "medium": 100,
+    "large": 10000,
+}
+
+SERIALIZER = Serializer()
+
+
+def item(i):
+    return {"id": i, "name": "item-%s" % i, "tags": ["a", "b", "c"], "price": 1.5 * i, "active": i % 2 == 0}
+
+
+@functools.lru_cache(maxsize=None)
+def payload(size, content_type):
+    """Return the encoded payload of size items."""
+    data = [item(i) for i in range(PAYLOAD_SIZES[size])]
+    return SERIALIZER.get_serializer(content_type=content_type).dumps(data)
+
+
+def accepted(request):
+    return request.headers.get("Accept", "application/json").split(",")[0].strip()
+
+
+async def items(request):
+    """GET: payload of size items, encoded with the first accepted content type; POST: read the body."""
+    if request.method == "POST":
+        await request.read()
+        return web.Response(status=201, body=b'{"ok": true}', content_type="application/json")
+    content_type = accepted(request)
+    return web.Response(body=payload(request.query.get("size", "small"), content_type), headers={"Content-Type": content_type})
+
+
+async def pages(request):
+    """Link header pagination over pages pages of size items."""
+    number = int(request.query.get("page", 1))
+    count = int(request.query.get("pages", 10))
+    size = request.query.get("size", "medium")
+    headers = {"Content-Type": "application/json"}
+    if number < count:
+        headers["Link"] = '<%s?page=%s&pages=%s&size=%s>; rel="next"' % (request.path, number + 1, count, size)
+    return web.Response(body=payload(size, "application/json"), headers=headers)
+
+
+async def stream(request):
+    """Stream bytes bytes."""
+    return web.Response(body=b"x" * int(request.query.get("bytes", 1024 * 1024)))
+
+
+def create_app():
+    app = web.Application(client_max_size=1024 ** 3)
+    app.router.add_route("*", "/items{path:.*}", items)
+    app.router.add_get("/pages", pages)
+    app.router.add_get("/stream", stream)
+    return app
+
+
+class Server:
+    """The stand-in server, running in a background thread with its own event loop."""
+
+    def __init__(self, host="127.0.0.1"):
+        self.host = host
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._runner = web.AppRunner(create_app(), access_log=None)
+        self._thread = None
+
+    @property
+    def url(self):
+        return "http://%s:%s" % (self.host, self.port)
+
+    def start(self):
+        with socket.socket() as s:
+            s.bind((self.host, 0))
+            self.port = s.getsockname()[1]
+        self._loop.run_until_complete(self._runner.setup())
+        self._loop.run_until_complete(web.TCPSite(self._runner, self.host, self.port).start())
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
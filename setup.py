@@ -1,8 +1,8 @@
 import setuptools
 import sys
 
-if sys.version_info < (3, 6, 0):
-    raise RuntimeError("aiohttp requires Python 3.6.0+")
+if sys.version_info < (3, 9, 0):
+    raise RuntimeError("aionap requires Python 3.9.0+")
 
 
 setuptools.setup(
@@ -19,11 +19,15 @@ setuptools.setup(
     packages=setuptools.find_packages(exclude=['docs', 'tests*']),
 
     install_requires=open('requirements.txt').readlines(),
+    python_requires='>=3.9',
 
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
     ],
 )
@@ -1,10 +1,17 @@
+import asyncio
 import collections
 import contextlib
+import hashlib
 import pytest
 import socket
 import subprocess
+import threading
 import time
 
+from aiohttp import web
+
+from aionap.serialize import Serializer
+
 from urllib.error import URLError
 from urllib.request import urlopen
 
@@ -38,14 +45,18 @@ def wait_for_httpbin(url):
     raise Exception("httpbin server not reachable!!!")
 
 
-@pytest.fixture(scope="session")
-def tcp_port():
+def unused_port():
     """Find an unused localhost TCP port from 1024-65535 and return it."""
     with contextlib.closing(socket.socket()) as sock:
         sock.bind(("127.0.0.1", 0))
         return sock.getsockname()[1]
 
 
+@pytest.fixture(scope="session")
+def tcp_port():
+    return unused_port()
+
+
 @pytest.yield_fixture(scope="session")
 def httpbin(tcp_port):
     httpbin_cmd = f"gunicorn httpbin:app --bind 127.0.0.1:{tcp_port} --log-level DEBUG"
@@ -61,6 +72,172 @@ def httpbin(tcp_port):
     httpbin_proc.kill()
 
 
+PAGE_ITEMS = list(range(25))
+PAGE_SIZE = 10
+
+
+def page(number):
+    return PAGE_ITEMS[(number - 1) * PAGE_SIZE:number * PAGE_SIZE]
+
+
+async def pages_link(request):
+    number = int(request.query.get("page", 1))
+    headers = {}
+    if number * PAGE_SIZE < len(PAGE_ITEMS):
+        headers["Link"] = f'<{request.path}?page={number + 1}>; rel="next"'
+    return web.json_response(page(number), headers=headers)
+
+
+async def pages_hydra(request):
+    number = int(request.query.get("page", 1))
+    view = {"@id": f"{request.path}?page={number}"}
+    if number * PAGE_SIZE < len(PAGE_ITEMS):
+        view["hydra:next"] = f"{request.path}?page={number + 1}"
+    return web.json_response({"hydra:member": page(number), "hydra:view": view})
+
+
+async def pages_cursor(request):
+    number = int(request.query.get("cursor", 1))
+    next_cursor = str(number + 1) if number * PAGE_SIZE < len(PAGE_ITEMS) else None
+    return web.json_response({"items": page(number), "next_cursor": next_cursor})
+
+
+async def pages_offset(request):
+    offset = int(request.query.get("offset", 0))
+    limit = int(request.query["limit"])
+    return web.json_response(PAGE_ITEMS[offset:offset + limit])
+
+
+FLAKY_ATTEMPTS = {}
+
+
+async def flaky(request):
+    """Fail the first 'fail' requests of every key with 503."""
+    attempts = FLAKY_ATTEMPTS
+    key = request.match_info["key"]
+    attempts[key] = attempts.get(key, 0) + 1
+    if attempts[key] <= int(request.query.get("fail", 2)):
+        return web.json_response({"attempts": attempts[key]}, status=503)
+    return web.json_response({"attempts": attempts[key]})
+
+
+SLOW_ATTEMPTS = {}
+
+
+async def slow(request):
+    """The first request of every key takes 'delay' seconds, all others answer immediately."""
+    key = request.match_info["key"]
+    SLOW_ATTEMPTS[key] = attempt = SLOW_ATTEMPTS.get(key, 0) + 1
+    if attempt == 1:
+        await asyncio.sleep(float(request.query.get("delay", 1)))
+    return web.json_response({"attempt": attempt})
+
+
+async def content(request):
+    """Return body (encoded with encoding) with the Content-Type type."""
+    body = request.query["body"].encode(request.query.get("encoding", "utf-8"))
+    return web.Response(body=body, headers={"Content-Type": request.query["type"]})
+
+
+async def decoded(request):
+    """Return the (by aiohttp decompressed) request body and its Content-Encoding."""
+    return web.json_response({
+        "content_encoding": request.headers.get("Content-Encoding"),
+        "data": (await request.read()).decode("utf-8"),
+    })
+
+
+async def upload(request):
+    """Return the size and hash of the request body or of each part of a multipart body."""
+    if request.content_type == "multipart/form-data":
+        parts = {}
+        async for part in await request.multipart():
+            body = await part.read()
+            parts[part.name] = {"filename": part.filename, "size": len(body), "md5": hashlib.md5(body).hexdigest()}
+        return web.json_response({"parts": parts})
+
+    body = await request.read()
+    return web.json_response({
+        "content_length": request.headers.get("Content-Length"),
+        "transfer_encoding": request.headers.get("Transfer-Encoding"),
+        "content_type": request.content_type,
+        "size": len(body),
+        "md5": hashlib.md5(body).hexdigest(),
+    })
+
+
+DOWNLOAD_BODY = bytes(range(256)) * 4000
+DOWNLOAD_RANGES = []
+
+
+async def download(request):
+    """Return DOWNLOAD_BODY, byte ranges are supported unless the query parameter ranges=0.
+
+    head=0: answer HEAD requests with 405, range_start: ignore the start of requested ranges
+    """
+    headers = {"ETag": '"%s"' % request.query.get("version", "v1")}
+    if request.method == "HEAD" and request.query.get("head", "1") == "0":
+        return web.Response(status=405, headers={"Allow": "GET"})
+    if request.query.get("ranges", "1") == "0":
+        return web.Response(body=DOWNLOAD_BODY, headers=headers)
+
+    headers["Accept-Ranges"] = "bytes"
+    if request.method == "GET" and "Range" in request.headers:
+        if request.headers.get("If-Range", headers["ETag"]) == headers["ETag"]:
+            byte_range = request.http_range
+            start, stop = byte_range.start, min(byte_range.stop, len(DOWNLOAD_BODY))
+            if "range_start" in request.query:
+                start = int(request.query["range_start"])
+            DOWNLOAD_RANGES.append((start, stop))
+            headers["Content-Range"] = "bytes %s-%s/%s" % (start, stop - 1, len(DOWNLOAD_BODY))
+            return web.Response(status=206, body=DOWNLOAD_BODY[start:stop], headers=headers)
+    return web.Response(body=DOWNLOAD_BODY, headers=headers)
+
+
+async def negotiate(request):
+    """Return the request Accept header encoded with the first accepted content type."""
+    content_type = request.headers["Accept"].split(",")[0].strip()
+    body = Serializer().get_serializer(content_type=content_type).dumps({"accept": request.headers["Accept"]})
+    return web.Response(body=body, headers={"Content-Type": content_type})
+
+
+def create_app():
+    """Stand-in server for everything httpbin can't do."""
+    app = web.Application()
+    app.router.add_get("/pages/link", pages_link)
+    app.router.add_get("/pages/hydra", pages_hydra)
+    app.router.add_get("/pages/cursor", pages_cursor)
+    app.router.add_get("/pages/offset", pages_offset)
+    app.router.add_route("*", "/flaky/{key}", flaky)
+    app.router.add_get("/slow/{key}", slow)
+    app.router.add_get("/content", content)
+    app.router.add_post("/decoded", decoded)
+    app.router.add_get("/negotiate", negotiate)
+    app.router.add_route("*", "/upload", upload)
+    app.router.add_get("/download", download)
+    return app
+
+
+@pytest.fixture(scope="session")
+def local_server():
+    """Run the stand-in aiohttp server in a background thread."""
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(create_app())
+    loop.run_until_complete(runner.setup())
+    host = "localhost"
+    port = unused_port()
+    loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    # return and run tests
+    yield Server(Url(f"http://{host}:{port}"), host, port)
+    # stop the server
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.run_until_complete(runner.cleanup())
+    loop.close()
+
+
 # @pytest.fixture(scope='session')
 # def httpbin(tcp_port):
 #     return Server(Url("http://eu.httpbin.org"), "eu.httpbin.org", 80)
@@ -56,3 +56,47 @@ async def test_api_auth():
 #    api = aionap.API("http://localhost", session_kwargs=dict(conn_timeout=5))
 #    assert api._store['session']._conn_timeout == 5
 #    await api.close()
+
+
+async def test_resource_children_are_cached():
+    api = aionap.API("http://localhost/api")
+    assert api.foo is api.foo
+    assert api.foo.bar is api.foo.bar
+    assert api.foo(1) is not api.foo(1)
+    assert api.foo.bar.url == "http://localhost/api/foo/bar"
+    assert api.foo(1).bar(2).url == "http://localhost/api/foo/1/bar/2"
+    # no per resource copies of the config
+    assert api.foo.bar._store is api.foo(1)._store
+    await api.close()
+
+
+async def test_resource_slots():
+    api = aionap.API("http://localhost")
+    assert not hasattr(api.foo, "__dict__")
+    await api.close()
+
+
+async def test_resource_append_slash_url():
+    api = aionap.API("http://localhost", append_slash=True)
+    assert api.foo.url == "http://localhost/foo/"
+    assert api.foo(1).bar.url == "http://localhost/foo/1/bar/"
+    await api.close()
+
+
+async def test_resource_options_do_not_leak():
+    api = aionap.API("http://localhost")
+    raw = api.foo.as_raw()
+    assert raw._store["raw"]
+    assert not api.foo._store["raw"]
+    assert raw.url == api.foo.url
+    yaml = api.foo(format="yaml")
+    assert yaml._store["format"] == "yaml"
+    assert yaml.bar._store["format"] == "yaml"
+    assert api.foo._store["format"] == "json"
+    await api.close()
+
+
+async def test_resource_url_override():
+    api = aionap.API("http://localhost")
+    assert api.foo(url_override="http://example.com/bar").url == "http://example.com/bar"
+    await api.close()
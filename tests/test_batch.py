@@ -0,0 +1,123 @@
+import asyncio
+
+import aionap
+import pytest
+
+from aionap.batch import ConcurrencyLimiter, run_many
+
+pytestmark = pytest.mark.asyncio
+
+
+class Counter:
+    def __init__(self):
+        self.current = 0
+        self.max = 0
+
+    async def __call__(self, arg):
+        self.current += 1
+        self.max = max(self.max, self.current)
+        try:
+            await asyncio.sleep(0.001 * (arg % 3))
+            if arg == 13:
+                raise ValueError(arg)
+            return arg * 2
+        finally:
+            self.current -= 1
+
+
+@pytest.mark.parametrize("concurrency, expected_max", [(None, 20), (1, 1), (5, 5), (100, 20)])
+async def test_run_many(concurrency, expected_max):
+    counter = Counter()
+    results = dict([r async for r in run_many(counter, range(20), concurrency=concurrency)])
+    assert counter.max == expected_max
+    assert sorted(results) == list(range(20))
+    assert isinstance(results.pop(13), ValueError)
+    assert all(results[i] == i * 2 for i in results)
+
+
+async def test_run_many_empty():
+    assert [r async for r in run_many(None, [])] == []
+
+
+async def test_run_many_invalid_concurrency():
+    with pytest.raises(ValueError):
+        [r async for r in run_many(None, [1], concurrency=0)]
+
+
+async def test_concurrency_limiter():
+    limiter = ConcurrencyLimiter(limit=4, limit_per_host=2)
+    total = Counter()
+    per_host = {"host0": Counter(), "host1": Counter(), "host2": Counter()}
+
+    async def request(arg):
+        host = "host%d" % (arg % 3)
+        async with limiter.slot(host):
+            # wait for both counters, also if one raises, before the slot is released
+            return await asyncio.gather(total(arg), per_host[host](arg), return_exceptions=True)
+
+    await asyncio.gather(*[request(i) for i in range(30)], return_exceptions=True)
+    assert total.max == 4
+    assert all(counter.max <= 2 for counter in per_host.values())
+
+
+async def test_get_many(httpbin):
+    async with aionap.API(httpbin.url, max_concurrency=5, max_concurrency_per_host=2) as api:
+        results = await api.status.get_many([200, 404, 201, 500, 200], concurrency=3)
+    assert results[0] == b""
+    assert isinstance(results[1], aionap.exceptions.HttpNotFoundError)
+    assert isinstance(results[3], aionap.exceptions.HttpServerError)
+
+
+async def test_iter_many(httpbin):
+    ids = ["a", "b", "c", "d"]
+    async with aionap.API(httpbin.url) as api:
+        results = dict([r async for r in api.anything.iter_many(ids, concurrency=2, foo="bar")])
+    assert sorted(results) == [0, 1, 2, 3]
+    for index, result in results.items():
+        assert result["url"].endswith("/anything/%s?foo=bar" % ids[index])
+
+
+class RecordingLimiter(ConcurrencyLimiter):
+    def __init__(self, limit):
+        super().__init__(limit=limit)
+        self.acquired = 0
+        self.current = 0
+        self.max = 0
+
+    async def acquire(self, host=None):
+        await super().acquire(host)
+        self.acquired += 1
+        self.current += 1
+        self.max = max(self.max, self.current)
+
+    def release(self, host=None):
+        self.current -= 1
+        super().release(host)
+
+
+async def test_limits_apply_to_streams(httpbin):
+    async with aionap.API(httpbin.url, max_concurrency=1) as api:
+        api._store["limiter"] = limiter = RecordingLimiter(limit=1)
+        stream = await api.bytes(100).stream()
+        second = asyncio.ensure_future(api.bytes(100).stream())
+        await asyncio.sleep(0.1)
+        assert not second.done()
+        assert len(b"".join([chunk async for chunk in stream])) == 100
+        async with await second:
+            assert limiter.current == 1
+        items = [item async for item in api.json.aiter_items(path=("slideshow", "slides"))]
+    assert items
+    assert limiter.acquired == 3
+    assert limiter.current == 0
+
+
+async def test_limits_apply_to_paginate_and_download(local_server, tmpdir):
+    async with aionap.API(local_server.url, max_concurrency=2) as api:
+        api._store["limiter"] = limiter = RecordingLimiter(limit=2)
+        assert [item async for item in api.pages.link.paginate(prefetch=3)]
+        pages = limiter.acquired
+        assert pages > 1
+        await api.download.download(str(tmpdir.join("download.bin")), parts=4)
+    assert limiter.acquired == pages + 1 + 4
+    assert limiter.max == 2
+    assert limiter.current == 0
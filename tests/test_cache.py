@@ -0,0 +1,142 @@
+import time
+
+import aionap
+import pytest
+
+from aionap.cache import ResponseCache, parse_cache_control
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, {}),
+    ("", {}),
+    ("no-cache", {"no-cache": None}),
+    ("public, max-age=60", {"public": None, "max-age": "60"}),
+    ('No-Store, max-age="10"', {"no-store": None, "max-age": "10"}),
+])
+def test_parse_cache_control(value, expected):
+    assert parse_cache_control(value) == expected
+
+
+def test_cache_max_age():
+    cache = ResponseCache()
+    key = cache.key("http://localhost/foo")
+    entry = cache.set(key, {"foo": "bar"}, {"Cache-Control": "max-age=60"})
+    assert entry.is_fresh
+    assert cache.get(key).content == {"foo": "bar"}
+
+
+def test_cache_validators_only():
+    cache = ResponseCache()
+    key = cache.key("http://localhost/foo")
+    entry = cache.set(key, "content", {"ETag": '"abc"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"})
+    assert not entry.is_fresh
+    assert entry.revalidation_headers == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Sat, 17 Oct 2026 10:00:00 GMT",
+    }
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"Cache-Control": "no-store", "ETag": "abc"},
+    {"Cache-Control": "no-cache"},
+])
+def test_cache_not_stored(headers):
+    cache = ResponseCache()
+    key = cache.key("http://localhost/foo")
+    assert cache.set(key, "content", headers) is None
+    assert cache.get(key) is None
+
+
+def test_cache_no_cache_revalidates():
+    cache = ResponseCache()
+    key = cache.key("http://localhost/foo")
+    entry = cache.set(key, "content", {"Cache-Control": "no-cache, max-age=60", "ETag": "abc"})
+    assert not entry.is_fresh
+
+
+def test_cache_expires_in_the_past():
+    cache = ResponseCache()
+    key = cache.key("http://localhost/foo")
+    entry = cache.set(key, "content", {"Expires": "Thu, 01 Jan 1970 00:00:00 GMT", "ETag": "abc"})
+    assert not entry.is_fresh
+
+
+def test_cache_refresh_keeps_validators():
+    cache = ResponseCache()
+    key = cache.key("http://localhost/foo")
+    entry = cache.set(key, "content", {"ETag": "abc"})
+    entry = cache.refresh(key, entry, {"Cache-Control": "max-age=60"})
+    assert entry.is_fresh
+    assert entry.etag == "abc"
+
+
+def test_cache_key():
+    assert ResponseCache.key("u", [("a", 1)], {"X-Foo": "1"}) == ResponseCache.key("u", [("a", 1)], {"x-foo": "1"})
+    assert ResponseCache.key("u", [("a", 1)]) != ResponseCache.key("u", [("a", 2)])
+
+
+def test_cache_lru_eviction():
+    cache = ResponseCache(max_size=2)
+    headers = {"Cache-Control": "max-age=60"}
+    cache.set("a", 1, headers)
+    cache.set("b", 2, headers)
+    # touch a -> b is the least recently used one
+    assert cache.get("a")
+    cache.set("c", 3, headers)
+    assert len(cache) == 2
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_cache_ttl():
+    cache = ResponseCache(ttl=0.01)
+    cache.set("a", 1, {"Cache-Control": "max-age=60"})
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_invalid_max_size():
+    with pytest.raises(ValueError):
+        ResponseCache(max_size=0)
+
+
+@pytest.mark.asyncio
+async def test_cache_fresh_response(httpbin):
+    async with aionap.API(httpbin.url, cache=True) as api:
+        first = await api.cache(60).get()
+        second = await api.cache(60).get()
+        # served from the fresh entry, no request at all
+        assert first is second
+        assert [entry.is_fresh for entry in api._store["cache"]._entries.values()] == [True]
+
+
+@pytest.mark.asyncio
+async def test_cache_revalidation(httpbin):
+    async with aionap.API(httpbin.url, cache=True) as api:
+        first = await api.etag("abc").get()
+        (entry,) = api._store["cache"]._entries.values()
+        assert not entry.is_fresh
+        # the server confirms the stale entry with 304, which returns the cached object
+        resp, _ = await api.etag("abc").as_raw().get(headers=entry.revalidation_headers)
+        assert resp.status == 304
+        second = await api.etag("abc").get()
+        assert first is second
+
+
+@pytest.mark.asyncio
+async def test_cache_params_are_part_of_the_key(httpbin):
+    async with aionap.API(httpbin.url, cache=ResponseCache()) as api:
+        first = await api.cache(60).get(foo="bar")
+        second = await api.cache(60).get(foo="baz")
+        assert first["args"] != second["args"]
+
+
+@pytest.mark.asyncio
+async def test_no_cache_by_default(httpbin):
+    async with aionap.API(httpbin.url) as api:
+        first = await api.cache(60).get()
+        second = await api.cache(60).get()
+        assert first is not second
@@ -0,0 +1,141 @@
+import uuid
+
+import aionap
+import pytest
+
+from aionap.circuitbreaker import CircuitBreaker
+from aionap.exceptions import CircuitOpenError
+
+URL = "http://localhost/foo"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def call(breaker, failed=False, duration=None, url=URL):
+    breaker.before_call(url)
+    breaker.record(url, failed=failed, duration=duration)
+
+
+def test_opens_on_failure_rate(clock):
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, clock=clock)
+    call(breaker)
+    call(breaker, failed=True)
+    call(breaker, failed=True)
+    assert breaker.state(URL) == "closed"
+    call(breaker, failed=True)
+    assert breaker.state(URL) == "open"
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call(URL)
+    assert excinfo.value.key == "localhost"
+    assert excinfo.value.retry_after == 30.0
+
+
+def test_window(clock):
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=2, window=10, clock=clock)
+    call(breaker, failed=True)
+    clock.now += 11
+    call(breaker, failed=True)
+    assert breaker.state(URL) == "closed"
+    assert breaker.stats() == {"localhost": {"state": "closed", "calls": 1, "failures": 1, "failure_rate": 1.0}}
+
+
+def test_slow_calls(clock):
+    breaker = CircuitBreaker(min_calls=2, slow_call_duration=1.0, clock=clock)
+    call(breaker, duration=0.5)
+    call(breaker, duration=2.0)
+    assert breaker.state(URL) == "open"
+
+
+def test_half_open(clock):
+    breaker = CircuitBreaker(min_calls=1, recovery_timeout=5, half_open_calls=2, clock=clock)
+    call(breaker, failed=True)
+    assert breaker.state(URL) == "open"
+    clock.now += 5
+    assert breaker.state(URL) == "half-open"
+    # two trial calls
+    breaker.before_call(URL)
+    breaker.before_call(URL)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call(URL)
+    breaker.record(URL)
+    breaker.record(URL)
+    assert breaker.state(URL) == "closed"
+
+
+def test_half_open_failure(clock):
+    breaker = CircuitBreaker(min_calls=1, recovery_timeout=5, clock=clock)
+    call(breaker, failed=True)
+    clock.now += 5
+    call(breaker, failed=True)
+    assert breaker.state(URL) == "open"
+
+
+def test_half_open_lost_trial(clock):
+    breaker = CircuitBreaker(min_calls=1, recovery_timeout=5, clock=clock)
+    call(breaker, failed=True)
+    clock.now += 5
+    breaker.before_call(URL)
+    clock.now += 5
+    # the first trial never reported back
+    breaker.before_call(URL)
+
+
+def test_scope(clock):
+    breaker = CircuitBreaker(min_calls=1, scope="path", clock=clock)
+    call(breaker, failed=True, url="http://localhost/foo?a=b")
+    assert breaker.state("http://localhost/foo") == "open"
+    assert breaker.state("http://localhost/bar") == "closed"
+
+
+def test_scope_path_template(clock):
+    breaker = CircuitBreaker(min_calls=2, scope="path", clock=clock)
+    # the ids of a path share one circuit
+    call(breaker, failed=True, url="http://localhost/items/1")
+    call(breaker, failed=True, url="http://localhost/items/2")
+    assert breaker.state("http://localhost/items/3") == "open"
+    assert list(breaker.stats()) == ["localhost/items/{id}"]
+    # the template of api.template() is used as it is
+    for tenant in ["acme", "other"]:
+        breaker.before_call("http://localhost/tenants/%s" % tenant, "/tenants/{tenant}")
+        breaker.record("http://localhost/tenants/%s" % tenant, failed=True, path_template="/tenants/{tenant}")
+    assert breaker.state("http://localhost/tenants/foo", "/tenants/{tenant}") == "open"
+    assert breaker.state("http://localhost/tenants/foo") == "closed"
+
+
+@pytest.mark.parametrize("kwargs", [{"failure_rate": 0}, {"failure_rate": 1.5}, {"scope": "foo"}])
+def test_invalid(kwargs):
+    with pytest.raises(ValueError):
+        CircuitBreaker(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker(local_server):
+    key = uuid.uuid4().hex
+    breaker = CircuitBreaker(min_calls=2, scope="path")
+    async with aionap.API(local_server.url, circuit_breaker=breaker) as api:
+        for _ in range(2):
+            with pytest.raises(aionap.exceptions.HttpServerError):
+                await api.flaky(key).get()
+        with pytest.raises(CircuitOpenError):
+            await api.flaky(key).get()
+        # the circuit is shared by all ids
+        with pytest.raises(CircuitOpenError):
+            await api.flaky(uuid.uuid4().hex).get()
+        # other paths aren't affected
+        await api.slow(uuid.uuid4().hex).get(delay=0)
+        # a template resource is keyed by its template
+        flaky = api.template("/flaky/{key}")
+        await flaky(key="a").get(fail=0)
+        assert breaker.state(flaky(key="b").url, "/flaky/{key}") == "closed"
+    assert breaker.state(api.flaky(key).url) == "open"
@@ -0,0 +1,100 @@
+import json
+
+import aiohttp
+import aionap
+import pytest
+
+from aionap.compression import CODECS, Compression, aiohttp_encodings, compress, decompress
+from aionap.exceptions import ImproperlyConfigured
+
+DATA = {"items": list(range(1000))}
+
+
+@pytest.mark.parametrize("encoding", list(CODECS))
+def test_codecs(encoding):
+    data = b"x" * 10000
+    compressed = compress(data, encoding)
+    assert len(compressed) < len(data)
+    assert decompress(compressed, encoding) == data
+
+
+def test_decompress_multiple_encodings():
+    data = b"x" * 100
+    assert decompress(compress(compress(data, "deflate"), "gzip"), "deflate, gzip") == data
+    assert decompress(data, "identity") == data
+
+
+def test_unknown_encoding():
+    with pytest.raises(ImproperlyConfigured):
+        compress(b"", "foo")
+    with pytest.raises(ImproperlyConfigured):
+        decompress(b"", "foo")
+    with pytest.raises(ImproperlyConfigured):
+        Compression(encoding="foo")
+    with pytest.raises(ImproperlyConfigured):
+        Compression(accept_encodings=["foo"])
+
+
+def test_threshold():
+    compression = Compression(encoding="gzip", threshold=10)
+    assert compression.compress(b"123456789") == (b"123456789", None)
+    data, encoding = compression.compress(b"1234567890")
+    assert encoding == "gzip"
+    assert gzip_decompress(data) == b"1234567890"
+    # per call encoding
+    assert compression.compress(b"1234567890", encoding="deflate")[1] == "deflate"
+    assert Compression().compress(b"1234567890") == (b"1234567890", None)
+
+
+def gzip_decompress(data):
+    return CODECS["gzip"][1](data)
+
+
+def test_accept_encoding():
+    assert Compression().get_accept_encoding() == ", ".join(aiohttp_encodings())
+    assert Compression().get_accept_encoding(auto_decompress=False) == ", ".join(CODECS)
+    assert Compression(accept_encodings=["gzip"]).get_accept_encoding() == "gzip"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", [e for e in CODECS if e in aiohttp_encodings()])
+async def test_compressed_request(local_server, encoding):
+    async with aionap.API(local_server.url, compression=Compression(encoding=encoding, threshold=100)) as api:
+        resp = await api.decoded.post(data=DATA)
+        assert resp["content_encoding"] == encoding
+        assert json.loads(resp["data"]) == DATA
+        # small bodies aren't compressed
+        resp = await api.decoded.post(data={"foo": "bar"})
+        assert resp["content_encoding"] is None
+
+
+@pytest.mark.asyncio
+async def test_compressed_request_per_call(local_server):
+    async with aionap.API(local_server.url, compression="gzip") as api:
+        resp = await api.decoded(compress="deflate").post(data=DATA)
+        assert resp["content_encoding"] == "deflate"
+        resp = await api.decoded(compress=False).post(data=DATA)
+        assert resp["content_encoding"] is None
+
+    async with aionap.API(local_server.url) as api:
+        resp = await api.decoded.post(data=DATA)
+        assert resp["content_encoding"] is None
+        resp = await api.decoded(compress="gzip").post(data=DATA)
+        assert resp["content_encoding"] == "gzip"
+
+
+@pytest.mark.asyncio
+async def test_accept_encoding_header(httpbin):
+    async with aionap.API(httpbin.url, compression=Compression(accept_encodings=["gzip"])) as api:
+        resp = await api.headers.get()
+    assert resp["headers"]["Accept-Encoding"] == "gzip"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, key", [("gzip", "gzipped"), ("deflate", "deflated"), ("brotli", "brotli")])
+@pytest.mark.parametrize("auto_decompress", [True, False])
+async def test_compressed_response(httpbin, path, key, auto_decompress):
+    session = aiohttp.ClientSession(auto_decompress=auto_decompress)
+    async with aionap.API(httpbin.url, session=session, compression=Compression()) as api:
+        resp = await getattr(api, path).get()
+    assert resp[key]
@@ -0,0 +1,119 @@
+import json
+import os
+
+import aionap
+import pytest
+
+from aionap.download import MANIFEST_SUFFIX, PART_SUFFIX, Manifest, parse_content_range
+
+from .conftest import DOWNLOAD_BODY, DOWNLOAD_RANGES
+
+pytestmark = pytest.mark.asyncio
+
+
+class Interrupt(Exception):
+    pass
+
+
+@pytest.mark.parametrize("parts", [1, 3, 8])
+async def test_download(local_server, tmpdir, parts):
+    path = str(tmpdir.join("download.bin"))
+    progress = []
+    DOWNLOAD_RANGES.clear()
+    async with aionap.API(local_server.url) as api:
+        assert await api.download.download(path, parts=parts, progress=lambda *args: progress.append(args)) == path
+    with open(path, "rb") as f:
+        assert f.read() == DOWNLOAD_BODY
+    assert len(DOWNLOAD_RANGES) == parts
+    assert sum(stop - start for start, stop in DOWNLOAD_RANGES) == len(DOWNLOAD_BODY)
+    assert progress[-1] == (len(DOWNLOAD_BODY), len(DOWNLOAD_BODY))
+    assert not os.path.exists(path + PART_SUFFIX)
+    assert not os.path.exists(path + MANIFEST_SUFFIX)
+
+
+async def test_download_without_ranges(local_server, tmpdir):
+    path = str(tmpdir.join("download.bin"))
+    DOWNLOAD_RANGES.clear()
+    async with aionap.API(local_server.url) as api:
+        await api.download.download(path, parts=4, ranges=0)
+    with open(path, "rb") as f:
+        assert f.read() == DOWNLOAD_BODY
+    assert DOWNLOAD_RANGES == []
+
+
+async def test_download_head_not_allowed(local_server, tmpdir):
+    path = str(tmpdir.join("download.bin"))
+    progress = []
+    DOWNLOAD_RANGES.clear()
+    async with aionap.API(local_server.url) as api:
+        await api.download.download(path, parts=4, progress=lambda *args: progress.append(args), head=0)
+    with open(path, "rb") as f:
+        assert f.read() == DOWNLOAD_BODY
+    assert DOWNLOAD_RANGES == []
+    assert progress[-1] == (len(DOWNLOAD_BODY), len(DOWNLOAD_BODY))
+
+
+async def test_download_wrong_content_range(local_server, tmpdir):
+    path = str(tmpdir.join("download.bin"))
+    async with aionap.API(local_server.url) as api:
+        with pytest.raises(aionap.exceptions.DownloadError):
+            await api.download.download(path, parts=2, range_start=0)
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("bytes 0-99/1000", (0, 99, 1000)),
+    ("bytes 100-199/*", (100, 199, None)),
+    ("BYTES 5-5/6", (5, 5, 6)),
+    ("bytes */1000", None),
+    ("0-99/1000", None),
+    (None, None),
+])
+async def test_parse_content_range(value, expected):
+    assert parse_content_range(value) == expected
+
+
+async def test_download_resume(local_server, tmpdir):
+    path = str(tmpdir.join("download.bin"))
+
+    def interrupt(downloaded, total):
+        if downloaded > total // 2:
+            raise Interrupt()
+
+    async with aionap.API(local_server.url) as api:
+        with pytest.raises(Interrupt):
+            await api.download.download(path, parts=4, chunk_size=4096, progress=interrupt)
+
+        manifest = Manifest.load(path)
+        assert 0 < manifest.downloaded < len(DOWNLOAD_BODY)
+        DOWNLOAD_RANGES.clear()
+        await api.download.download(path, parts=4)
+
+    with open(path, "rb") as f:
+        assert f.read() == DOWNLOAD_BODY
+    # only the missing bytes were downloaded again
+    assert sum(stop - start for start, stop in DOWNLOAD_RANGES) == len(DOWNLOAD_BODY) - manifest.downloaded
+    assert not os.path.exists(path + MANIFEST_SUFFIX)
+
+
+async def test_download_restart_if_changed(local_server, tmpdir):
+    path = str(tmpdir.join("download.bin"))
+    Manifest.create(path, local_server.url + "/download?version=v2", len(DOWNLOAD_BODY), '"v1"', 2).save()
+    with open(path + MANIFEST_SUFFIX) as f:
+        state = json.load(f)
+    state["ranges"] = [[start, end, end] for start, end, _ in state["ranges"]]
+    with open(path + MANIFEST_SUFFIX, "w") as f:
+        json.dump(state, f)
+    with open(path + PART_SUFFIX, "wb") as f:
+        f.write(b"\0" * len(DOWNLOAD_BODY))
+
+    async with aionap.API(local_server.url) as api:
+        await api.download.download(path, parts=2, version="v2")
+    with open(path, "rb") as f:
+        assert f.read() == DOWNLOAD_BODY
+
+
+async def test_download_invalid_parts(local_server, tmpdir):
+    async with aionap.API(local_server.url) as api:
+        with pytest.raises(ValueError):
+            await api.download.download(str(tmpdir.join("download.bin")), parts=0)
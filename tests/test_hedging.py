@@ -0,0 +1,143 @@
+import asyncio
+import time
+import uuid
+
+import aionap
+import pytest
+
+from aionap.hedging import HedgePolicy, hedged
+
+
+def make_func(*delays, error=None):
+    calls = []
+
+    async def func():
+        attempt = len(calls)
+        calls.append(attempt)
+        await asyncio.sleep(delays[attempt])
+        if error is not None and attempt == 0:
+            raise error
+        return attempt
+
+    return func, calls
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_for_fast_requests():
+    func, calls = make_func(0, 0)
+    assert await hedged(HedgePolicy(delay=0.05, max_ratio=1), func) == 0
+    assert calls == [0]
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins():
+    func, calls = make_func(1, 0)
+    start = time.monotonic()
+    assert await hedged(HedgePolicy(delay=0.01, max_ratio=1), func) == 1
+    assert time.monotonic() - start < 0.5
+    assert calls == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_first_attempt_wins():
+    func, calls = make_func(0.05, 1)
+    assert await hedged(HedgePolicy(delay=0.01, max_ratio=1), func) == 0
+    assert calls == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_failed_attempt_waits_for_hedge():
+    func, calls = make_func(0.05, 0.1, error=ValueError())
+    assert await hedged(HedgePolicy(delay=0.01, max_ratio=1), func) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_attempt_without_hedge():
+    func, calls = make_func(0, error=ValueError())
+    with pytest.raises(ValueError):
+        await hedged(HedgePolicy(delay=0.01, max_ratio=1), func)
+
+
+@pytest.mark.asyncio
+async def test_budget():
+    policy = HedgePolicy(delay=0.01, max_ratio=0.5)
+    hedges = 0
+    for _ in range(10):
+        func, calls = make_func(0.02, 0.02)
+        await hedged(policy, func)
+        hedges += len(calls) - 1
+    assert hedges == 5
+
+
+def test_percentile():
+    policy = HedgePolicy(delay=1, percentile=90, min_samples=10)
+    for latency in range(1, 10):
+        policy.observe(latency / 100)
+    # not enough samples
+    assert policy.hedge_delay() == 1
+    policy.observe(0.10)
+    assert policy.hedge_delay() == 0.10
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"percentile": 100}, {"delay": 1, "max_ratio": 0}])
+def test_invalid(kwargs):
+    with pytest.raises(ValueError):
+        HedgePolicy(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_hedged_get(local_server):
+    async with aionap.API(local_server.url, hedge=HedgePolicy(delay=0.02, max_ratio=1)) as api:
+        start = time.monotonic()
+        resp = await api.slow(uuid.uuid4().hex).get(delay=0.5)
+        assert time.monotonic() - start < 0.4
+    assert resp["attempt"] == 2
+
+
+@pytest.mark.asyncio
+async def test_hedge_per_call(local_server):
+    async with aionap.API(local_server.url) as api:
+        resp = await api.slow(uuid.uuid4().hex)(hedge=HedgePolicy(delay=0.05, max_ratio=1)).get(delay=0.5)
+    assert resp["attempt"] == 2
+
+
+@pytest.mark.asyncio
+async def test_hedge_true():
+    async with aionap.API("http://localhost", hedge=True) as api:
+        for policy in [api._store["hedge"], api.items(hedge=True)._store["hedge"]]:
+            assert policy.percentile == 95
+            # no hedges until enough latencies have been observed
+            assert policy.hedge_delay() is None
+        assert api.items(hedge=False)._store["hedge"] is False
+
+
+@pytest.mark.asyncio
+async def test_hedge_per_call_shorthand(local_server):
+    async with aionap.API(local_server.url) as api:
+        resource = api.slow(uuid.uuid4().hex)(hedge=0.05)
+        assert isinstance(resource._store["hedge"], HedgePolicy)
+        assert resource._store["hedge"].delay == 0.05
+        resp = await resource.get(delay=0)
+    assert resp["attempt"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_cached_get(local_server):
+    hedge = HedgePolicy(delay=0.02, max_ratio=1)
+    async with aionap.API(local_server.url, cache=True, hedge=hedge) as api:
+        resource = api.slow(uuid.uuid4().hex)
+        start = time.monotonic()
+        resp = await resource.get(delay=0.3)
+        assert time.monotonic() - start < 0.25
+        assert resp["attempt"] == 2
+
+        # the revalidation of a stale entry is hedged too
+        resource = api.slow(uuid.uuid4().hex)
+        key = api._store["cache"].key(resource.url, [("delay", 0.3)], None) + (api._store["format"],)
+        api._store["cache"].set(key, "stale", {"ETag": '"v1"', "Cache-Control": "no-cache"})
+        start = time.monotonic()
+        resp = await resource.get(delay=0.3)
+        assert time.monotonic() - start < 0.25
+        assert resp["attempt"] == 2
+        # the 200 response without caching headers replaced the stale entry
+        assert key not in api._store["cache"]
@@ -0,0 +1,111 @@
+import json
+
+import aionap
+import pytest
+
+from aionap.jsonstream import JsonItemsParser
+
+
+ITEMS = [1, -2.5e3, "a \"quoted\" string ] , {", True, None, {"id": 1, "tags": ["x", "y"]}, [[], {}], "ünïcödé"]
+
+
+def chunked(data, size):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def parse(data, path=None, size=1):
+    parser = JsonItemsParser(path=path)
+    items = []
+    for chunk in chunked(data, size):
+        items += parser.feed(chunk)
+    items += parser.close()
+    return items
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+def test_top_level_array(size):
+    data = json.dumps(ITEMS).encode("utf-8")
+    assert parse(data, size=size) == ITEMS
+
+
+@pytest.mark.parametrize("size", [1, 5, 100000])
+def test_path(size):
+    document = {
+        "@context": "/contexts/Book",
+        "hydra:totalItems": 12345,
+        "nested": {"hydra:member": ["wrong"]},
+        "hydra:member": ITEMS,
+        "hydra:view": {"hydra:next": "/books?page=2"},
+    }
+    data = json.dumps(document, indent=2).encode("utf-8")
+    assert parse(data, path="hydra:member", size=size) == ITEMS
+
+
+def test_nested_path():
+    data = json.dumps({"data": {"count": 3, "items": [1, 2, 3]}}).encode("utf-8")
+    assert parse(data, path=("data", "items"), size=3) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("data", [b"[]", b" [ ] ", b'{"items": []}'])
+def test_empty_array(data):
+    assert parse(data, path="items" if data.startswith(b"{") else None) == []
+
+
+def test_items_are_returned_early():
+    parser = JsonItemsParser()
+    assert parser.feed(b'[{"id": 1}, {"id"') == [{"id": 1}]
+    assert parser.feed(b': 2}, 12') == [{"id": 2}]
+    # the number could continue
+    assert parser.feed(b'3') == []
+    assert parser.feed(b']') == [123]
+    assert parser.done
+    assert parser.close() == []
+
+
+def test_incomplete_document():
+    parser = JsonItemsParser()
+    parser.feed(b"[1, 2")
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+@pytest.mark.parametrize("data, path", [
+    (b"{}", None),
+    (b'{"foo": []}', "bar"),
+    (b'[1 2]', None),
+])
+def test_invalid_document(data, path):
+    with pytest.raises(ValueError):
+        parse(data, path=path)
+
+
+@pytest.mark.parametrize("data", [b'[{"a": 1,}, ', b'[1, tru, 2', b'["a", @, ', b'[{"a": [1}, '])
+def test_invalid_item_raises_early(data):
+    parser = JsonItemsParser()
+    with pytest.raises(ValueError):
+        parser.feed(data)
+
+
+def test_items_are_decoded_once():
+    document = {"skipped": {"text": "x\\\" ] }" * 100}, "items": [{"id": i, "name": "a, \"b\" ]"} for i in range(20)]}
+    data = json.dumps(document).encode("utf-8")
+    parser = JsonItemsParser(path="items")
+    decoder = parser._decoder
+    calls = []
+    parser._decoder = type("Decoder", (), {"raw_decode": lambda self, *args: calls.append(args) or decoder.raw_decode(*args)})()
+    items = []
+    for chunk in chunked(data, 3):
+        items += parser.feed(chunk)
+    items += parser.close()
+    assert items == document["items"]
+    # 2 keys, the skipped value and the items
+    assert len(calls) == 3 + len(items)
+
+
+@pytest.mark.asyncio
+async def test_aiter_items(httpbin):
+    async with aionap.API(httpbin.url) as api:
+        slides = [item async for item in api.json.aiter_items(path=("slideshow", "slides"), chunk_size=16)]
+        expected = await api.json.get()
+    assert slides == expected["slideshow"]["slides"]
@@ -0,0 +1,81 @@
+import aiohttp
+import aionap
+import pytest
+
+from aionap.metrics import Histogram, Metrics
+
+from .conftest import unused_port
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    assert histogram.percentile(50) is None
+    for value in [0.05, 0.1, 0.5, 5]:
+        histogram.observe(value)
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(5.65)
+    assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+    assert histogram.percentile(50) == 0.1
+    assert histogram.percentile(75) == 1.0
+    assert histogram.percentile(100) == float("inf")
+
+
+def test_prometheus():
+    metrics = Metrics(buckets=(0.1,))
+    metrics.observe("ttfb", "GET", 200, '/items/"{id}"', 0.05)
+    assert metrics.prometheus().splitlines() == [
+        "# HELP aionap_request_duration_seconds Duration of the phases of HTTP requests.",
+        "# TYPE aionap_request_duration_seconds histogram",
+        'aionap_request_duration_seconds_bucket{phase="ttfb",method="GET",status="2xx",path="/items/\\"{id}\\"",le="0.1"} 1',
+        'aionap_request_duration_seconds_bucket{phase="ttfb",method="GET",status="2xx",path="/items/\\"{id}\\"",le="+Inf"} 1',
+        'aionap_request_duration_seconds_sum{phase="ttfb",method="GET",status="2xx",path="/items/\\"{id}\\""} 0.05',
+        'aionap_request_duration_seconds_count{phase="ttfb",method="GET",status="2xx",path="/items/\\"{id}\\""} 1',
+    ]
+
+
+def phases(metrics):
+    return {(x["phase"], x["method"], x["status"], x["path"]): x["count"] for x in metrics.snapshot()}
+
+
+@pytest.mark.asyncio
+async def test_metrics(httpbin):
+    metrics = Metrics()
+    async with aionap.API(httpbin.url, metrics=metrics) as api:
+        await api.anything(1).get()
+        await api.anything(2).get()
+        await api.anything.post({"a": 1})
+        with pytest.raises(aionap.exceptions.HttpNotFoundError):
+            await api.status(404).get()
+
+    counts = phases(metrics)
+    for phase in ["connect", "ttfb", "body", "deserialize", "total"]:
+        assert counts[(phase, "GET", "2xx", "/anything/{id}")] >= 1
+    assert counts[("total", "GET", "2xx", "/anything/{id}")] == 2
+    assert counts[("serialize", "POST", "2xx", "/anything")] == 1
+    assert counts[("total", "GET", "4xx", "/status/{id}")] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_template(local_server):
+    metrics = Metrics()
+    async with aionap.API(local_server.url, metrics=metrics) as api:
+        items = api.template("/pages/{kind}")
+        await items(kind="link").get()
+        await items(kind="hydra").get()
+    assert phases(metrics)[("total", "GET", "2xx", "/pages/{kind}")] == 2
+
+
+@pytest.mark.asyncio
+async def test_metrics_error():
+    metrics = Metrics()
+    async with aionap.API("http://127.0.0.1:%s" % unused_port(), metrics=metrics) as api:
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await api.items(1).get()
+    assert phases(metrics)[("total", "GET", "error", "/items/{id}")] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_with_session():
+    async with aiohttp.ClientSession() as session:
+        with pytest.raises(aionap.exceptions.ImproperlyConfigured):
+            aionap.API("http://localhost", session=session, metrics=Metrics())
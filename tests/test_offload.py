@@ -0,0 +1,62 @@
+import concurrent.futures
+import json
+import multiprocessing
+
+import aionap
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+LARGE = json.dumps([{"id": i, "name": "item-%s" % i} for i in range(60)])
+
+
+class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.calls = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.calls.append(fn.__name__)
+        return super().submit(fn, *args, **kwargs)
+
+
+@pytest.fixture
+def executor():
+    executor = CountingExecutor()
+    yield executor
+    executor.shutdown()
+
+
+async def test_offload_large_responses(local_server, executor):
+    async with aionap.API(local_server.url, offload_threshold=1000, executor=executor) as api:
+        assert await api.content.get(type="application/json", body="[1, 2]") == [1, 2]
+        assert executor.calls == []
+        assert await api.content.get(type="application/json", body=LARGE) == json.loads(LARGE)
+        assert executor.calls == ["decode"]
+
+
+async def test_offload_disabled(local_server, executor):
+    async with aionap.API(local_server.url, offload_threshold=1000, executor=executor) as api:
+        assert await api.content(offload=False).get(type="application/json", body=LARGE) == json.loads(LARGE)
+        assert await api.content.get(type="application/json", body=LARGE) == json.loads(LARGE)
+    assert executor.calls == ["decode"]
+
+
+async def test_offload_resource(local_server, executor):
+    async with aionap.API(local_server.url, executor=executor, compression="gzip") as api:
+        resp = await api.decoded(offload=True).post(json.loads(LARGE))
+        assert json.loads(resp["data"]) == json.loads(LARGE)
+    assert executor.calls == ["dumps", "compress", "decode"]
+
+
+async def test_offload_default_executor(local_server):
+    async with aionap.API(local_server.url, offload_threshold=1) as api:
+        assert await api.content.get(type="application/json", body=LARGE) == json.loads(LARGE)
+
+
+async def test_offload_process_pool(local_server):
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        async with aionap.API(local_server.url, offload_threshold=1, executor=executor) as api:
+            assert await api.content.get(type="application/json", body=LARGE) == json.loads(LARGE)
+            assert await api.content.get(type="application/x-yaml", body="a: 1") == {"a": 1}
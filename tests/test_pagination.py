@@ -0,0 +1,80 @@
+import asyncio
+
+import aionap
+import pytest
+
+from aionap.pagination import (
+    AutoPagination,
+    CursorPagination,
+    HydraPagination,
+    LinkHeaderPagination,
+    OffsetPagination,
+    Paginator,
+)
+
+from .conftest import PAGE_ITEMS
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize("path, pagination", [
+    ("link", LinkHeaderPagination()),
+    ("link", AutoPagination()),
+    ("link", None),
+    ("hydra", HydraPagination()),
+    ("hydra", AutoPagination()),
+    ("cursor", CursorPagination()),
+    ("offset", OffsetPagination(limit=10)),
+    ("offset", OffsetPagination(limit=5)),
+    ("offset", OffsetPagination(limit=25)),
+])
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+async def test_paginate(local_server, path, pagination, prefetch):
+    async with aionap.API(local_server.url) as api:
+        items = [item async for item in api.pages(path).paginate(pagination=pagination, prefetch=prefetch)]
+    assert items == PAGE_ITEMS
+
+
+async def test_paginate_params(local_server):
+    async with aionap.API(local_server.url) as api:
+        items = [item async for item in api.pages.offset.paginate(OffsetPagination(limit=10), offset=20)]
+    assert items == PAGE_ITEMS[20:]
+
+
+async def test_paginate_error(httpbin):
+    async with aionap.API(httpbin.url) as api:
+        with pytest.raises(aionap.exceptions.HttpServerError):
+            async for _ in api.status(500).paginate():
+                pass
+
+
+class FakeResponse:
+    links = {}
+    url = "http://localhost/items"
+
+
+@pytest.mark.parametrize("prefetch", [1, 2, 5])
+async def test_prefetch(prefetch):
+    fetched = []
+
+    async def fetch(url, params):
+        fetched.append(dict(params)["offset"])
+        return FakeResponse(), [len(fetched)]
+
+    pagination = OffsetPagination(limit=1)
+    paginator = Paginator(fetch, pagination, "http://localhost/items", [("offset", 0)], prefetch=prefetch)
+    pages = paginator.pages()
+    assert await pages.__anext__() == [1]
+    # give the producer a chance to run ahead
+    await asyncio.sleep(0.01)
+    # page 1 consumed, prefetch pages fetched ahead and the next one waits for a free slot
+    assert fetched == list(range(1 + prefetch))
+    assert await pages.__anext__() == [2]
+    await asyncio.sleep(0.01)
+    assert fetched == list(range(2 + prefetch))
+    await pages.aclose()
+
+
+async def test_invalid_prefetch():
+    with pytest.raises(ValueError):
+        Paginator(None, OffsetPagination(), "http://localhost", [], prefetch=-1)
@@ -0,0 +1,64 @@
+import asyncio
+
+import aiohttp
+import aionap
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_pool_settings():
+    async with aionap.API(
+        "http://localhost", pool_size=10, pool_size_per_host=2, keepalive_timeout=5, dns_cache_ttl=60
+    ) as api:
+        connector = api._store["session"].connector
+        assert connector.limit == 10
+        assert connector.limit_per_host == 2
+        assert connector._keepalive_timeout == 5
+        assert api.pool_stats()["limit"] == 10
+
+
+@pytest.mark.asyncio
+async def test_pool_settings_with_session():
+    async with aiohttp.ClientSession() as session:
+        with pytest.raises(aionap.exceptions.ImproperlyConfigured):
+            aionap.API("http://localhost", session=session, pool_size=10)
+        with pytest.raises(aionap.exceptions.ImproperlyConfigured):
+            aionap.API("http://localhost", session=session, pool_stats=True)
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_disabled(local_server):
+    async with aionap.API(local_server.url) as api:
+        assert not api._store["session"].trace_configs
+        await api.pages.link.get()
+        await api.pages.link.get()
+        stats = api.pool_stats()
+    host = stats["hosts"]["%s:%s" % (local_server.host, local_server.port)]
+    # the connector state without the counters of the trace hooks
+    assert host["idle"] == 1
+    assert host["created"] == host["reused"] == 0
+    assert stats["reuse_ratio"] is None
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(local_server):
+    async with aionap.API(local_server.url, pool_size_per_host=2, pool_stats=True) as api:
+        stats = api.pool_stats()
+        assert stats["open"] == 0
+        assert stats["reuse_ratio"] is None
+
+        await asyncio.gather(*[api.pages.link.get() for _ in range(4)])
+        await api.pages.link.get()
+
+        stats = api.pool_stats()
+        host = stats["hosts"]["%s:%s" % (local_server.host, local_server.port)]
+        assert host["created"] == 2
+        assert host["reused"] == 3
+        assert host["reuse_ratio"] == 3 / 5
+        assert host["queued"] == 2
+        assert host["wait_time"] > 0
+        assert host["idle"] == 2
+        assert host["acquired"] == 0
+        assert host["open"] == 2
+        assert stats["reused"] == 3
+        assert stats["open"] == 2
@@ -0,0 +1,133 @@
+import time
+
+import aionap
+import pytest
+
+from aionap.ratelimit import RateLimiter, TokenBucket, parse_retry_after
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Response:
+    def __init__(self, status=200, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("", None),
+    ("120", 120.0),
+    ("0.5", 0.5),
+    ("-1", 0.0),
+    ("Thu, 01 Jan 1970 00:00:00 GMT", 0.0),
+    ("invalid", None),
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert parse_retry_after("Sat, 17 Oct 2026 10:01:00 GMT", now=1792231200.0) == 60.0
+
+
+def test_token_bucket():
+    clock = Clock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+    # burst
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # reservations
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+    clock.now += 1.0
+    assert bucket.reserve() == 0.5
+    # refill is capped by burst
+    clock.now += 100
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0.5
+
+
+def test_token_bucket_pause():
+    clock = Clock()
+    bucket = TokenBucket(rate=10, clock=clock)
+    bucket.pause(5)
+    assert bucket.reserve() == 5
+    clock.now += 5
+    assert bucket.reserve() == 0
+
+
+@pytest.mark.parametrize("kwargs", [{"rate": 0}, {"rate": 1, "scope": "foo"}])
+def test_rate_limiter_invalid(kwargs):
+    with pytest.raises(ValueError):
+        RateLimiter(**kwargs)
+
+
+@pytest.mark.parametrize("scope, same", [
+    ("global", True),
+    ("host", True),
+    ("path", False),
+])
+def test_rate_limiter_scope(scope, same):
+    limiter = RateLimiter(rate=1, scope=scope)
+    first = limiter.bucket("http://localhost/foo")
+    assert (first is limiter.bucket("http://localhost/bar?a=b")) == same
+    assert first is limiter.bucket("http://localhost/foo?a=b")
+    if scope != "global":
+        assert first is not limiter.bucket("http://example.com/foo")
+
+
+def test_rate_limiter_scope_path_template():
+    limiter = RateLimiter(rate=1, scope="path")
+    # the ids of a path share one bucket
+    items = limiter.bucket("http://localhost/items/1")
+    assert items is limiter.bucket("http://localhost/items/2?a=b")
+    assert items is not limiter.bucket("http://localhost/items/1/tags")
+    # the template of api.template() is used as it is
+    tenants = limiter.bucket("http://localhost/tenants/acme", "/tenants/{tenant}")
+    assert tenants is limiter.bucket("http://localhost/tenants/other", "/tenants/{tenant}")
+    assert tenants is not limiter.bucket("http://localhost/tenants/other")
+    assert len(limiter._buckets) == 4
+
+
+@pytest.mark.parametrize("response, delay", [
+    (Response(200), None),
+    (Response(429), None),
+    (Response(429, {"Retry-After": "3"}), 3.0),
+    (Response(503, {"Retry-After": "3"}), 3.0),
+    (Response(200, {"Retry-After": "3"}), None),
+    (Response(200, {"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "10"}), None),
+    (Response(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "10"}), 10.0),
+    (Response(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}), 0.0),
+    (Response(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1500000000"}), 0.0),
+])
+def test_rate_limiter_update(response, delay):
+    clock = Clock()
+    limiter = RateLimiter(rate=100, clock=clock)
+    assert limiter.update("http://localhost/foo", response) == delay
+    assert limiter.bucket("http://localhost/foo").reserve() == (delay or 0)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit(httpbin):
+    async with aionap.API(httpbin.url, rate_limit=RateLimiter(rate=20, burst=1)) as api:
+        start = time.monotonic()
+        for _ in range(5):
+            await api.get.get()
+        assert time.monotonic() - start >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_pause(httpbin):
+    async with aionap.API(httpbin.url, rate_limit=1000) as api:
+        await getattr(api, "response-headers").get(**{"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.3"})
+        start = time.monotonic()
+        await api.get.get()
+        assert time.monotonic() - start >= 0.3
@@ -1,10 +1,14 @@
+import asyncio
+import base64
 import aionap
 import pytest
 
 pytestmark = pytest.mark.asyncio
 
+BINARY_DATA_PREFIX = "data:application/octet-stream;base64,"
 
-@pytest.fixture(params=[f for f in aionap.serialize.SERIALIZERS])
+
+@pytest.fixture(params=[f for f, available in aionap.serialize.SERIALIZERS.items() if available])
 def format(request):
     return request.param
 
@@ -158,7 +162,11 @@ async def test_send_data(httpbin, format, http_send_method):
         resp = await getattr(resource, http_send_method)(data=data)
         assert format in resp["headers"].get("Accept")
         assert format in resp["headers"].get("Content-Type")
-        assert serializer.dumps(data) == resp["data"]
+        sent = resp["data"]
+        if sent.startswith(BINARY_DATA_PREFIX):
+            # httpbin returns binary data base64 encoded
+            sent = base64.b64decode(sent[len(BINARY_DATA_PREFIX):])
+        assert serializer.loads(sent) == data
 
 
 async def test_send_files(httpbin, tmpdir, http_send_method):
@@ -197,3 +205,131 @@ async def test_request_kwargs(httpbin):
         resource = getattr(api, "user-agent")
         resp = await resource.get()
         assert not resp["user-agent"]
+
+
+async def test_coalesce_concurrent_gets(httpbin):
+    async with aionap.API(httpbin.url, coalesce=True) as api:
+        results = await asyncio.gather(*[api.uuid.get() for _ in range(10)])
+        assert all(r is results[0] for r in results)
+        assert not api._store["inflight"]
+        # a new request after the first one finished
+        assert await api.uuid.get() is not results[0]
+
+
+async def test_coalesce_params_and_headers(httpbin):
+    async with aionap.API(httpbin.url, coalesce=True) as api:
+        first, second, third = await asyncio.gather(
+            api.anything.get(foo="bar"),
+            api.anything.get(foo="baz"),
+            api.anything.get(foo="bar", headers={"X-Answer": "42"}),
+        )
+        assert first["args"] == {"foo": "bar"}
+        assert second["args"] == {"foo": "baz"}
+        assert third["headers"]["X-Answer"] == "42"
+
+
+async def test_coalesce_exceptions(httpbin):
+    async with aionap.API(httpbin.url, coalesce=True) as api:
+        results = await asyncio.gather(*[api.status(500).get() for _ in range(5)], return_exceptions=True)
+        assert all(isinstance(r, aionap.exceptions.HttpServerError) for r in results)
+        assert not api._store["inflight"]
+
+
+async def test_no_coalesce_by_default(httpbin):
+    async with aionap.API(httpbin.url) as api:
+        first, second = await asyncio.gather(api.uuid.get(), api.uuid.get())
+        assert first["uuid"] != second["uuid"]
+
+
+@pytest.mark.parametrize("chunk_size", [1024, 4096, 100000])
+async def test_stream(httpbin, chunk_size):
+    async with aionap.API(httpbin.url) as api:
+        stream = await api.bytes(10000).stream(chunk_size=chunk_size, seed=42)
+        assert stream.status == 200
+        chunks = [chunk async for chunk in stream]
+        assert all(len(chunk) <= chunk_size for chunk in chunks)
+        assert len(b"".join(chunks)) == 10000
+
+
+async def test_stream_context_manager(httpbin):
+    async with aionap.API(httpbin.url) as api:
+        async with await api.bytes(10000).stream(chunk_size=10) as stream:
+            async for chunk in stream:
+                assert len(chunk) <= 10
+                break
+        assert stream.response.closed or stream.response.connection is None
+
+
+async def test_stream_error(httpbin):
+    async with aionap.API(httpbin.url) as api:
+        with pytest.raises(aionap.exceptions.HttpNotFoundError):
+            await api.status(404).stream()
+
+
+async def test_lazy(httpbin, http_method):
+    async with aionap.API(httpbin.url) as api:
+        resp = await getattr(api.anything.as_lazy(), http_method)(foo="bar")
+        assert isinstance(resp, aionap.LazyResponse)
+        assert resp.status == 200
+        assert resp.headers["Content-Type"] == "application/json"
+        data = await resp.data()
+        assert data["args"] == {"foo": "bar"}
+        assert await resp.data() is data
+        assert isinstance(await resp.content(), bytes)
+
+
+async def test_lazy_release_unread(httpbin):
+    async with aionap.API(httpbin.url) as api:
+        async with await api.bytes(100000).as_lazy().get() as resp:
+            assert resp.status == 200
+        assert resp.response.closed or resp.response.connection is None
+        assert not api.bytes._store["lazy"]
+
+
+async def test_lazy_error(httpbin):
+    async with aionap.API(httpbin.url) as api:
+        with pytest.raises(aionap.exceptions.HttpNotFoundError):
+            await api.status(404).as_lazy().delete()
+
+
+@pytest.mark.parametrize("content_type, body, encoding", [
+    ("application/problem+json", '{"answer": "ü"}', "utf-8"),
+    ("application/json; charset=iso-8859-1", '{"answer": "ü"}', "iso-8859-1"),
+    ("application/vnd.foo+yaml", "answer: ü", "utf-8"),
+])
+async def test_response_content_types(local_server, content_type, body, encoding):
+    async with aionap.API(local_server.url) as api:
+        resp = await api.content.get(type=content_type, body=body, encoding=encoding)
+    assert resp == {"answer": "ü"}
+
+
+@pytest.mark.parametrize("format", [f for f, available in aionap.serialize.SERIALIZERS.items() if available])
+async def test_format_per_call(local_server, format):
+    content_type = aionap.serialize.Serializer().get_content_type(format)
+    async with aionap.API(local_server.url) as api:
+        resp = await api.negotiate(format=format).get()
+    assert resp["accept"].startswith(content_type)
+
+
+async def test_cached_children_dont_keep_the_response(local_server):
+    async with aionap.API(local_server.url) as api:
+        await api.pages.link.get()
+        assert not hasattr(api.pages.link, "_")
+        resource = api.pages("link")
+        await resource.get()
+        assert resource._.status == 200
+
+
+async def test_format_is_part_of_the_coalesce_and_cache_keys(local_server):
+    json_type = aionap.serialize.Serializer().get_content_type("json")
+    yaml_type = aionap.serialize.Serializer().get_content_type("yaml")
+    async with aionap.API(local_server.url, coalesce=True) as api:
+        first, second = await asyncio.gather(api.negotiate(format="json").get(), api.negotiate(format="yaml").get())
+    assert first["accept"].startswith(json_type)
+    assert second["accept"].startswith(yaml_type)
+
+    async with aionap.API(local_server.url, cache=True) as api:
+        cache = api._store["cache"]
+        cache.set(cache.key(api.negotiate.url) + ("json",), "cached", {"Cache-Control": "max-age=60"})
+        assert await api.negotiate(format="json").get() == "cached"
+        assert (await api.negotiate(format="yaml").get())["accept"].startswith(yaml_type)
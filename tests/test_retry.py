@@ -0,0 +1,124 @@
+import asyncio
+import uuid
+
+import aiohttp
+import aionap
+import pytest
+
+from aionap.retry import RetryPolicy
+
+from .conftest import unused_port
+
+
+class Response:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+@pytest.mark.parametrize("method, attempt, kwargs, expected", [
+    ("GET", 1, {"status": 503}, True),
+    ("get", 2, {"status": 502}, True),
+    ("GET", 3, {"status": 503}, False),
+    ("GET", 1, {"status": 500}, False),
+    ("GET", 1, {"status": 200}, False),
+    ("PUT", 1, {"status": 504}, True),
+    ("DELETE", 1, {"status": 504}, True),
+    ("POST", 1, {"status": 503}, False),
+    ("PATCH", 1, {"status": 503}, False),
+    ("POST", 1, {"status": 503, "idempotent": True}, True),
+    ("GET", 1, {"exception": aiohttp.ServerDisconnectedError()}, True),
+    ("GET", 1, {"exception": asyncio.TimeoutError()}, True),
+    ("GET", 1, {"exception": ValueError()}, False),
+    ("POST", 1, {"exception": asyncio.TimeoutError()}, False),
+])
+def test_is_retryable(method, attempt, kwargs, expected):
+    assert RetryPolicy(max_attempts=3).is_retryable(method, attempt, **kwargs) == expected
+
+
+def test_delay():
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+    assert [policy.delay(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+    policy = RetryPolicy(backoff=1, max_backoff=5)
+    assert all(0 <= policy.delay(attempt) <= 4 for attempt in range(1, 4) for _ in range(20))
+
+
+def test_delay_retry_after():
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+    assert policy.delay(1, Response({"Retry-After": "3"})) == 3
+    assert policy.delay(1, Response({"Retry-After": "30"})) == 5
+    assert policy.delay(2, Response({"Retry-After": "1"})) == 2
+
+
+def test_invalid_max_attempts():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+@pytest.fixture
+def key():
+    return uuid.uuid4().hex
+
+
+@pytest.mark.asyncio
+async def test_retry(local_server, key):
+    async with aionap.API(local_server.url, retry=RetryPolicy(backoff=0)) as api:
+        resp = await api.flaky(key).get()
+    assert resp["attempts"] == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_attempts_exceeded(local_server, key):
+    async with aionap.API(local_server.url, retry=RetryPolicy(max_attempts=2, backoff=0)) as api:
+        with pytest.raises(aionap.exceptions.HttpServerError) as excinfo:
+            await api.flaky(key).get()
+    assert excinfo.value.content["attempts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_disabled_by_default(local_server, key):
+    async with aionap.API(local_server.url) as api:
+        with pytest.raises(aionap.exceptions.HttpServerError):
+            await api.flaky(key).get()
+
+
+@pytest.mark.asyncio
+async def test_retry_per_call(local_server, key):
+    async with aionap.API(local_server.url, retry=RetryPolicy(backoff=0)) as api:
+        with pytest.raises(aionap.exceptions.HttpServerError):
+            await api.flaky(key)(retry=False).get()
+        resp = await api.flaky(key)(retry=RetryPolicy(max_attempts=5, backoff=0)).get(fail=4)
+    assert resp["attempts"] == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("retry, max_attempts", [(True, RetryPolicy().max_attempts), (5, 5)])
+async def test_retry_shorthands(retry, max_attempts):
+    async with aionap.API("http://localhost", retry=retry) as api:
+        assert api._store["retry"].max_attempts == max_attempts
+        assert api.items(retry=retry)._store["retry"].max_attempts == max_attempts
+        assert api.items(retry=False)._store["retry"] is False
+
+
+@pytest.mark.asyncio
+async def test_retry_per_call_shorthand(local_server, key):
+    async with aionap.API(local_server.url) as api:
+        resource = api.flaky(key)(retry=3)
+        assert resource._store["retry"].max_attempts == 3
+        resp = await resource.get()
+    assert resp["attempts"] == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_post(local_server, key):
+    async with aionap.API(local_server.url, retry=RetryPolicy(backoff=0)) as api:
+        with pytest.raises(aionap.exceptions.HttpServerError):
+            await api.flaky(key).post(data={"foo": "bar"})
+        resp = await api.flaky(key)(idempotent=True).post(data={"foo": "bar"})
+    assert resp["attempts"] == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_connection_error():
+    async with aionap.API(f"http://127.0.0.1:{unused_port()}", retry=RetryPolicy(backoff=0)) as api:
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await api.foo.get()
@@ -1,9 +1,16 @@
 
 import json
+import math
 import pytest
 import yaml
 
+from aionap.exceptions import SerializerNotAvailable
+from aionap.serialize import JSON_BACKENDS
+from aionap.serialize import SERIALIZERS
+from aionap.serialize import CborSerializer
+from aionap.serialize import MsgpackSerializer
 from aionap.serialize import JsonSerializer
+from aionap.serialize import parse_content_type
 from aionap.serialize import Serializer
 from aionap.serialize import YamlSerializer
 
@@ -22,6 +29,10 @@ def data_as(data):
             return json.dumps(data)
         if format == 'yaml':
             return yaml.dump(data)
+        if format == 'msgpack':
+            return pytest.importorskip("msgpack").packb(data)
+        if format == 'cbor':
+            return pytest.importorskip("cbor2").dumps(data)
         raise Exception('Unknown format')
     return dumps
 
@@ -36,10 +47,112 @@ def data_as(data):
     ('yaml', 'text/x-yaml', YamlSerializer),
     ('yaml', 'application/yaml', YamlSerializer),
     ('yaml', 'application/x-yaml', YamlSerializer),
+    ('msgpack', 'application/msgpack', MsgpackSerializer),
+    ('msgpack', 'application/x-msgpack', MsgpackSerializer),
+    ('msgpack', 'application/vnd.msgpack', MsgpackSerializer),
+    ('msgpack', 'application/vnd.foo+msgpack', MsgpackSerializer),
+    ('cbor', 'application/cbor', CborSerializer),
+    ('cbor', 'application/vnd.foo+cbor', CborSerializer),
 ])
 def test_serializers(data, data_as, format, content_type, klass):
+    if not SERIALIZERS[format]:
+        pytest.skip("%s is not installed" % format)
     format_serializer = Serializer().get_serializer(content_type=content_type)
     assert isinstance(format_serializer, klass)
     result = format_serializer.dumps(data)
-    assert result == data_as(format)
     assert data == format_serializer.loads(result)
+    assert data == format_serializer.loads(data_as(format))
+
+
+@pytest.mark.parametrize("backend", list(JSON_BACKENDS))
+def test_json_backends(data, backend):
+    serializer = JsonSerializer(backend=backend)
+    result = serializer.dumps(data)
+    assert isinstance(result, bytes)
+    assert json.loads(result) == data
+    assert serializer.loads(result) == data
+    assert serializer.loads(result.decode("utf-8")) == data
+
+
+@pytest.mark.parametrize("backend", list(JSON_BACKENDS))
+@pytest.mark.parametrize("value", [
+    {1: 2},
+    2 ** 64 + 1,
+    -2 ** 70,
+    [2 ** 64, 1.5, "12345678901234567890"],
+    {"a": [1, None, {"b": math.inf}]},
+    [None, -math.inf],
+])
+def test_json_backends_stdlib_compatible(backend, value):
+    serializer = JsonSerializer(backend=backend)
+    expected = json.loads(json.dumps(value))
+    # repr: exact integers, no floats instead of integers and Infinity instead of null
+    assert repr(json.loads(serializer.dumps(value))) == repr(expected)
+    for document in [json.dumps(value), json.dumps(value).encode("utf-8")]:
+        result = serializer.loads(document)
+        assert result == expected
+        assert repr(result) == repr(expected)
+
+
+@pytest.mark.parametrize("backend", list(JSON_BACKENDS))
+def test_json_backends_nan(backend):
+    serializer = JsonSerializer(backend=backend)
+    assert math.isnan(serializer.loads("NaN"))
+    assert serializer.loads("[Infinity, -Infinity]") == [math.inf, -math.inf]
+    nan, null = json.loads(serializer.dumps([math.nan, None]))
+    assert math.isnan(nan) and null is None
+    assert serializer.dumps(math.inf) == b"Infinity"
+
+
+def test_json_backend_default():
+    expected = next(name for name in ["msgspec", "orjson", "ujson", "json"] if name in JSON_BACKENDS)
+    assert JsonSerializer().backend == expected
+    assert Serializer(json_backend="json").get_serializer("json").backend == "json"
+
+
+def test_json_backend_not_available():
+    with pytest.raises(SerializerNotAvailable):
+        JsonSerializer(backend="foobar")
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("application/json", ("application/json", None, None)),
+    ("Application/JSON; charset=UTF-8", ("application/json", None, "utf-8")),
+    ('application/problem+json;charset="iso-8859-1"', ("application/problem+json", "json", "iso-8859-1")),
+    ("application/vnd.foo.v1+yaml; version=1", ("application/vnd.foo.v1+yaml", "yaml", None)),
+])
+def test_parse_content_type(value, expected):
+    assert parse_content_type(value) == expected
+
+
+@pytest.mark.parametrize("content_type, klass", [
+    ("application/json; charset=utf-8", JsonSerializer),
+    ("APPLICATION/JSON", JsonSerializer),
+    ("application/problem+json", JsonSerializer),
+    ("application/vnd.foo+json; charset=utf-8", JsonSerializer),
+    ("application/vnd.foo+yaml", YamlSerializer),
+    ("text/yaml; charset=utf-8", YamlSerializer),
+])
+def test_get_serializer_content_type_parameters_and_suffixes(content_type, klass):
+    assert isinstance(Serializer().get_serializer(content_type=content_type), klass)
+
+
+@pytest.mark.parametrize("content_type", ["text/html", "application/vnd.foo+xml", "application/jsonx"])
+def test_get_serializer_not_available(content_type):
+    with pytest.raises(SerializerNotAvailable):
+        Serializer().get_serializer(content_type=content_type)
+
+
+def test_get_serializer_first_registered_wins():
+    class OtherJsonSerializer(JsonSerializer):
+        key = "other"
+
+    first, second = JsonSerializer(), OtherJsonSerializer()
+    assert Serializer(serializers=[first, second]).get_serializer(content_type="application/json") is first
+
+
+def test_get_accept():
+    serializer = Serializer(serializers=[JsonSerializer(), YamlSerializer()])
+    assert serializer.get_accept() == "application/json, text/yaml;q=0.5"
+    assert serializer.get_accept("yaml") == "text/yaml, application/json;q=0.5"
+    assert Serializer(serializers=[JsonSerializer()]).get_accept() == "application/json"
@@ -0,0 +1,86 @@
+import concurrent.futures
+import json
+import threading
+
+import aionap
+import pytest
+
+from aionap.sync import LoopThread, SyncResource, get_loop_thread
+
+from .conftest import DOWNLOAD_BODY, PAGE_ITEMS
+
+
+@pytest.fixture
+def api(local_server):
+    with aionap.SyncAPI(local_server.url) as api:
+        yield api
+
+
+def test_get(api):
+    assert api.pages.link.get() == PAGE_ITEMS[:10]
+    assert api.pages("link").get(page=2) == PAGE_ITEMS[10:20]
+    assert isinstance(api.pages.link, SyncResource)
+    assert api.pages.link.url == api._resource.pages.link.url
+
+
+def test_post(api):
+    assert json.loads(api.decoded.post({"a": 1})["data"]) == {"a": 1}
+
+
+def test_error(api):
+    with pytest.raises(aionap.exceptions.HttpNotFoundError):
+        api.missing.get()
+
+
+def test_paginate(api):
+    assert list(api.pages.hydra.paginate()) == PAGE_ITEMS
+    pages = api.pages.link.paginate()
+    assert next(pages) == PAGE_ITEMS[0]
+    pages.close()
+
+
+def test_get_many_and_template(api):
+    assert api.pages.get_many(["link", "hydra"])[0] == PAGE_ITEMS[:10]
+    pages = api.template("/pages/{kind}")
+    assert pages(kind="cursor").get()["items"] == PAGE_ITEMS[:10]
+
+
+def test_download(api, tmpdir):
+    path = str(tmpdir.join("download.bin"))
+    api.download.download(path, parts=2)
+    with open(path, "rb") as f:
+        assert f.read() == DOWNLOAD_BODY
+
+
+def test_async_only_attributes(api):
+    with pytest.raises(AttributeError):
+        api.pages.stream
+
+
+def test_threads_share_the_pool(local_server):
+    with aionap.SyncAPI(local_server.url, pool_size_per_host=4, pool_stats=True) as api:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: api.pages.link.get(), range(40)))
+        stats = api.pool_stats()
+    assert results == [PAGE_ITEMS[:10]] * 40
+    assert stats["created"] <= 4
+    assert stats["reused"] >= 36
+
+
+def test_shared_loop_thread(local_server):
+    with aionap.SyncAPI(local_server.url) as first, aionap.SyncAPI(local_server.url) as second:
+        assert first._loop_thread is second._loop_thread is get_loop_thread()
+
+
+def test_call_from_loop_thread():
+    loop_thread = LoopThread()
+    try:
+        async def nested():
+            return loop_thread.run(nested())
+
+        with pytest.raises(RuntimeError):
+            loop_thread.run(nested())
+    finally:
+        loop_thread.stop()
+    assert not loop_thread.thread.is_alive()
+    assert threading.current_thread() is not loop_thread.thread
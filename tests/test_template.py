@@ -0,0 +1,68 @@
+import aionap
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize("base_url, template, values, expected", [
+    ("http://localhost", "/tenants/{tenant}/items/{id}", {"tenant": "acme", "id": 42}, "http://localhost/tenants/acme/items/42"),
+    ("http://localhost/", "tenants/{tenant}", {"tenant": "acme"}, "http://localhost/tenants/acme"),
+    ("http://localhost/api", "/items", {}, "http://localhost/api/items"),
+    ("http://localhost/api/", "/items/{id}/", {"id": 1}, "http://localhost/api/items/1/"),
+    # percent-encoding
+    ("http://localhost", "/items/{id}", {"id": "a/b c?d%"}, "http://localhost/items/a%2Fb%20c%3Fd%25"),
+    ("http://localhost", "/100%/{id}", {"id": "ü"}, "http://localhost/100%/%C3%BC"),
+    ("http://localhost/my%20api", "/items/{id}", {"id": 1}, "http://localhost/my%20api/items/1"),
+    ("http://localhost/my%20api/", "/items", {}, "http://localhost/my%20api/items"),
+])
+async def test_template_url(base_url, template, values, expected):
+    api = aionap.API(base_url)
+    assert api.template(template).url(**values) == expected
+    assert api.template(template)(**values).url == expected
+    await api.close()
+
+
+async def test_template_append_slash():
+    api = aionap.API("http://localhost", append_slash=True)
+    assert api.template("/items/{id}")(id=1).url == "http://localhost/items/1/"
+    await api.close()
+
+
+async def test_template_same_as_attributes():
+    api = aionap.API("http://localhost")
+    assert api.template("/tenants/{tenant}/items/{id}")(tenant="t", id=1).url == api.tenants("t").items(1).url
+    await api.close()
+
+
+async def test_template_path_template():
+    api = aionap.API("http://localhost/api")
+    item = api.template("/items/{id}")(id=1)
+    assert item._store["path_template"] == "/api/items/{id}"
+    assert item(format="json")._store["path_template"] == "/api/items/{id}"
+    # resources below a template resource aren't described by the template
+    assert item.tags._store["path_template"] is None
+    assert item(2)._store["path_template"] is None
+    await api.close()
+
+
+@pytest.mark.parametrize("template", ["/items/{}", "/items/{0}", "/items/{id:>10}", "/items/{id!r}", "/items/{a.b}"])
+async def test_template_invalid(template):
+    api = aionap.API("http://localhost")
+    with pytest.raises(ValueError):
+        api.template(template)
+    await api.close()
+
+
+@pytest.mark.parametrize("values", [{}, {"id": 1, "foo": 2}, {"foo": 2}])
+async def test_template_wrong_values(values):
+    api = aionap.API("http://localhost")
+    with pytest.raises(TypeError):
+        api.template("/items/{id}")(**values)
+    await api.close()
+
+
+async def test_template_request(httpbin):
+    async with aionap.API(httpbin.url) as api:
+        anything = api.template("/anything/{kind}/{id}")
+        resp = await anything(kind="items", id="a b").get(foo="bar")
+    assert resp["url"].endswith("/anything/items/a%20b?foo=bar")
@@ -0,0 +1,133 @@
+import dataclasses
+import json
+import typing
+
+import aionap
+import pytest
+
+from aionap.serialize import JsonSerializer, YamlSerializer
+from aionap.typed import _converter, convert
+
+
+@dataclasses.dataclass
+class Tag:
+    __slots__ = ("name",)
+    name: str
+
+
+@dataclasses.dataclass
+class Item:
+    __slots__ = ("id", "name", "tags", "parent")
+    id: int
+    name: str
+    tags: typing.List[Tag]
+    parent: typing.Optional[Tag]
+
+
+class Point(typing.NamedTuple):
+    x: int
+    y: int
+
+
+ITEMS = [
+    {"id": 1, "name": "one", "tags": [{"name": "a"}], "parent": None, "unknown": True},
+    {"id": 2, "name": "two", "tags": [], "parent": {"name": "b"}},
+]
+EXPECTED = [Item(1, "one", [Tag("a")], None), Item(2, "two", [], Tag("b"))]
+
+
+@pytest.mark.parametrize("converter", [lambda data, type: _converter(type)(data), convert])
+def test_convert(converter):
+    assert converter(ITEMS, typing.List[Item]) == EXPECTED
+    assert converter([1, 2], Point) == Point(1, 2)
+    assert converter({"a": [1, 2]}, typing.Dict[str, Point]) == {"a": Point(1, 2)}
+    assert converter([1, 2], typing.Tuple[int, ...]) == (1, 2)
+
+
+@dataclasses.dataclass
+class Defaults:
+    id: int
+    name: str = "default"
+    tags: typing.List[str] = dataclasses.field(default_factory=list)
+
+
+@pytest.mark.parametrize("converter", [lambda data, type: _converter(type)(data), convert])
+@pytest.mark.parametrize("data, type", [
+    ([1, 2], Item),
+    ({"id": "1", "name": "one", "tags": [], "parent": None}, Item),
+    ({"id": 1, "name": "one", "tags": [{"name": 2}], "parent": None}, Item),
+    ({"id": 1, "name": "one", "tags": []}, Item),
+    ({"name": "one"}, Defaults),
+    ([1], Point),
+    ([1, "2"], Point),
+    ({"a": 1}, typing.List[int]),
+    ([1, 2.5], typing.List[int]),
+    ([True], typing.List[int]),
+    (["a"], typing.List[float]),
+    ([1, "a"], typing.Tuple[int, int]),
+    ([None, "a"], typing.List[typing.Optional[int]]),
+])
+def test_convert_invalid(converter, data, type):
+    # the same with and without msgspec
+    with pytest.raises(aionap.exceptions.ValidationError):
+        converter(data, type)
+
+
+@pytest.mark.parametrize("converter", [lambda data, type: _converter(type)(data), convert])
+def test_convert_defaults_and_coercion(converter):
+    assert converter({"id": 1}, Defaults) == Defaults(1)
+    assert converter([1, 2.5], typing.List[float]) == [1.0, 2.5]
+    assert converter([None, 1], typing.List[typing.Optional[int]]) == [None, 1]
+    assert converter([1, "a"], typing.List[typing.Union[int, str]]) == [1, "a"]
+
+
+def test_convert_error_path():
+    with pytest.raises(aionap.exceptions.ValidationError, match=r"\$\[0\]\.tags\[0\]\.name"):
+        _converter(typing.List[Item])([{"id": 1, "name": "one", "tags": [{"name": 2}], "parent": None}])
+
+
+@pytest.mark.parametrize("serializer", [JsonSerializer(), YamlSerializer()])
+def test_loads_as_invalid(serializer):
+    with pytest.raises(aionap.exceptions.ValidationError):
+        serializer.loads_as(b'[{"id": "1"}]', typing.List[Item])
+
+
+@pytest.mark.parametrize("serializer", [JsonSerializer(), YamlSerializer()])
+def test_loads_as(serializer):
+    assert serializer.loads_as(json.dumps(ITEMS).encode("utf-8"), typing.List[Item]) == EXPECTED
+
+
+def test_loads_as_msgspec_struct():
+    msgspec = pytest.importorskip("msgspec")
+
+    class Entry(msgspec.Struct):
+        id: int
+        name: str
+
+    entries = JsonSerializer().loads_as(json.dumps(ITEMS).encode("utf-8"), typing.List[Entry])
+    assert entries == [Entry(1, "one"), Entry(2, "two")]
+
+
+@pytest.mark.asyncio
+async def test_get_type(local_server):
+    async with aionap.API(local_server.url) as api:
+        resource = api.content(type=typing.List[Item])
+        assert await resource.get(type="application/json", body=json.dumps(ITEMS)) == EXPECTED
+        # the type doesn't leak into the other resources
+        assert await api.content.get(type="application/json", body=json.dumps(ITEMS)) == ITEMS
+
+
+@pytest.mark.asyncio
+async def test_get_type_cached(local_server):
+    async with aionap.API(local_server.url, cache=True) as api:
+        params = {"type": "application/json", "body": json.dumps(ITEMS)}
+        assert await api.content.get(**params) == ITEMS
+        assert await api.content(type=typing.List[Item]).get(**params) == EXPECTED
+
+
+@pytest.mark.asyncio
+async def test_paginate_type(local_server):
+    async with aionap.API(local_server.url) as api:
+        items = [item async for item in api.pages.link(type=float).paginate()]
+    assert items == [float(x) for x in range(25)]
+    assert all(isinstance(item, float) for item in items)
@@ -0,0 +1,84 @@
+import hashlib
+import io
+import os
+
+import aionap
+import pytest
+
+from aionap.upload import Multipart, Upload
+
+BODY = os.urandom(300000)
+MD5 = hashlib.md5(BODY).hexdigest()
+
+
+@pytest.fixture
+def path(tmpdir):
+    path = tmpdir.join("artifact.bin")
+    path.write_binary(BODY)
+    return str(path)
+
+
+async def chunks():
+    for start in range(0, len(BODY), 50000):
+        yield BODY[start:start + 50000]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("source, chunked", [
+    (lambda path: path, False),
+    (lambda path: BODY, False),
+    (lambda path: io.BytesIO(BODY), True),
+    (lambda path: chunks(), True),
+    (lambda path: [BODY[:1000], BODY[1000:]], True),
+])
+async def test_upload(local_server, path, source, chunked):
+    progress = []
+    upload = Upload(source(path), chunk_size=8192, progress=lambda *args: progress.append(args))
+    async with aionap.API(local_server.url) as api:
+        resp = await api.upload.put(file=upload)
+    assert resp["size"] == len(BODY)
+    assert resp["md5"] == MD5
+    assert resp["content_type"] == "application/octet-stream"
+    if chunked:
+        assert resp["transfer_encoding"] == "chunked"
+    else:
+        assert resp["content_length"] == str(len(BODY))
+        assert progress[-1] == (len(BODY), len(BODY))
+    assert progress[-1][0] == len(BODY)
+    assert [sent for sent, _ in progress] == sorted(sent for sent, _ in progress)
+
+
+@pytest.mark.asyncio
+async def test_upload_empty_file(local_server, tmpdir):
+    path = tmpdir.join("empty.bin")
+    path.write_binary(b"")
+    async with aionap.API(local_server.url) as api:
+        resp = await api.upload.post(file=Upload(str(path)))
+    assert resp["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_with_fields(local_server, path):
+    async with aionap.API(local_server.url) as api:
+        resp = await api.upload.post(data={"kind": "artifact"}, file=Upload(path))
+    assert resp["parts"]["kind"]["size"] == len("artifact")
+    assert resp["parts"]["file"] == {"filename": "artifact.bin", "size": len(BODY), "md5": MD5}
+
+
+@pytest.mark.asyncio
+async def test_multipart(local_server, path):
+    files = {"a": Upload(path), "b": Upload(chunks(), filename="b.bin"), "c": io.BytesIO(b"c" * 10)}
+    async with aionap.API(local_server.url) as api:
+        resp = await api.upload.post(file=Multipart(fields={"kind": "artifact"}, files=files))
+    parts = resp["parts"]
+    assert parts["a"] == {"filename": "artifact.bin", "size": len(BODY), "md5": MD5}
+    assert parts["b"] == {"filename": "b.bin", "size": len(BODY), "md5": MD5}
+    assert parts["c"]["filename"] == "c"
+    assert parts["c"]["size"] == 10
+
+
+def test_upload_invalid_source():
+    with pytest.raises(TypeError):
+        Upload(42)
+    with pytest.raises(ValueError):
+        Upload(b"", chunk_size=0)
@@ -73,3 +73,33 @@ def test_urljoin(urljoin_args, expected):
 ])
 def test_transform_url_parameters(params, expected):
     assert sorted(aionap.utils.transform_url_parameters(params)) == sorted(expected)
+
+
+@pytest.mark.parametrize("base", [
+    "",
+    "/",
+    "/path",
+    "/path/",
+    "example.com",
+    "http://example.com",
+    "http://example.com/",
+    "https://example.com:443/path",
+    "https://example.com:443/path/",
+    "http://example.com/path?key=value",
+    "http://example.com/path#fragment",
+])
+@pytest.mark.parametrize("segment", ["", "test", "test/", 1, "/absolute", "a b", "a?b"])
+def test_join_segment(base, segment):
+    assert aionap.utils.join_segment(base, segment) == aionap.utils.urljoin(base, segment)
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/items/42", "/items/{id}"),
+    ("/items/42/tags/", "/items/{id}/tags/"),
+    ("/items/3f2504e0-4f89-11d3-9a0c-0305e82c3301", "/items/{id}"),
+    ("/commits/0123456789abcdef0123", "/commits/{id}"),
+    ("/items/latest", "/items/latest"),
+    ("/", "/"),
+])
+def test_path_template(path, expected):
+    assert aionap.utils.path_template(path) == expected